@@ -0,0 +1,307 @@
+import random
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional, Type
+
+import numpy as np
+
+from battleship.core import CellState, ShipType
+from battleship.corpus import open_corpus
+from battleship.generator import PlacementGenerator
+from battleship.strategy import Strategy, RandomStrategy
+
+
+class BatchStrategy(ABC):
+    """Abstract base class for strategies that choose shots for many games at once."""
+
+    def __init__(self, board_size: int = 10, rng: Optional[np.random.Generator] = None):
+        """
+        Initialize the batch strategy.
+
+        Args:
+            board_size: Size of the board (default: 10x10)
+            rng: NumPy random generator (default: a freshly seeded one)
+        """
+        self.board_size = board_size
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.num_games = 0
+
+    def reset(self, num_games: int):
+        """
+        Reset the strategy state for a new batch of games.
+
+        Args:
+            num_games: Number of games in the batch
+        """
+        self.num_games = num_games
+
+    @abstractmethod
+    def get_next_shots(self, active: np.ndarray) -> np.ndarray:
+        """
+        Determine the next position to shoot in every game.
+
+        Args:
+            active: (N,) boolean mask of games that are still running
+
+        Returns:
+            np.ndarray: (N, 2) integer array of (row, col) targets; rows of
+                finished games are ignored
+        """
+        pass
+
+    def register_results(self, shots: np.ndarray, results: np.ndarray, active: np.ndarray,
+                         sunk: Optional[np.ndarray] = None):
+        """
+        Register the results of a round of shots.
+
+        Args:
+            shots: (N, 2) array of the positions that were shot
+            results: (N,) array of CellState values (HIT or MISS)
+            active: (N,) boolean mask of games that took a shot this round
+            sunk: (N,) array of the size of the ship each shot sank, 0 if none,
+                or None if sunk ships are not announced
+        """
+        pass
+
+
+class ScalarStrategyBatch(BatchStrategy):
+    """Runs one ordinary Strategy instance per game for strategies without a batch implementation."""
+
+    def __init__(self, strategy_cls: Type[Strategy], board_size: int = 10,
+                 rng: Optional[np.random.Generator] = None):
+        """
+        Initialize the adapter.
+
+        Args:
+            strategy_cls: Strategy class to instantiate for each game
+            board_size: Size of the board (default: 10x10)
+            rng: NumPy random generator (default: a freshly seeded one)
+        """
+        super().__init__(board_size, rng)
+        self.strategy_cls = strategy_cls
+        self.strategies: List[Strategy] = []
+
+    def reset(self, num_games: int):
+        """Create a fresh strategy instance for each game, each seeded from the batch generator."""
+        super().reset(num_games)
+        seeds = self.rng.integers(2 ** 63, size=num_games)
+        self.strategies = [self.strategy_cls(self.board_size, random.Random(int(seed))) for seed in seeds]
+
+    def get_next_shots(self, active: np.ndarray) -> np.ndarray:
+        """Ask each running game's strategy for its next shot."""
+        shots = np.zeros((self.num_games, 2), dtype=np.intp)
+        for i in np.flatnonzero(active):
+            shots[i] = self.strategies[i].get_next_shot()
+        return shots
+
+    def register_results(self, shots: np.ndarray, results: np.ndarray, active: np.ndarray,
+                         sunk: Optional[np.ndarray] = None):
+        """Forward each running game's result to its strategy."""
+        for i in np.flatnonzero(active):
+            sunk_type = ShipType(int(sunk[i])) if sunk is not None and sunk[i] else None
+            self.strategies[i].register_result((int(shots[i, 0]), int(shots[i, 1])), CellState(int(results[i])),
+                                               sunk_type)
+
+
+# Vectorized implementations keyed by the scalar Strategy they replace
+_BATCH_STRATEGIES: Dict[Type[Strategy], Type[BatchStrategy]] = {}
+
+
+def register_batch_strategy(strategy_cls: Type[Strategy]) -> Callable[[Type[BatchStrategy]], Type[BatchStrategy]]:
+    """
+    Class decorator registering a BatchStrategy as the vectorized form of a Strategy.
+
+    Args:
+        strategy_cls: The scalar Strategy class the batch strategy implements
+
+    Returns:
+        The decorator
+    """
+    def decorator(batch_cls: Type[BatchStrategy]) -> Type[BatchStrategy]:
+        _BATCH_STRATEGIES[strategy_cls] = batch_cls
+        return batch_cls
+    return decorator
+
+
+def make_batch_strategy(strategy_cls: Type[Strategy], board_size: int = 10,
+                        rng: Optional[np.random.Generator] = None) -> BatchStrategy:
+    """
+    Get a batch strategy for a Strategy class.
+
+    Strategies that opted in through register_batch_strategy get their
+    vectorized implementation; all others run through ScalarStrategyBatch.
+
+    Args:
+        strategy_cls: The Strategy class to run
+        board_size: Size of the board (default: 10x10)
+        rng: NumPy random generator (default: a freshly seeded one)
+
+    Returns:
+        BatchStrategy: A strategy able to play many games at once
+    """
+    batch_cls = _BATCH_STRATEGIES.get(strategy_cls)
+    if batch_cls is None:
+        return ScalarStrategyBatch(strategy_cls, board_size, rng)
+    return batch_cls(board_size, rng)
+
+
+@register_batch_strategy(RandomStrategy)
+class BatchRandomStrategy(BatchStrategy):
+    """Vectorized RandomStrategy: each game shoots along its own random permutation of the cells."""
+
+    def reset(self, num_games: int):
+        """Draw a random shot order for every game."""
+        super().reset(num_games)
+        cells = self.board_size * self.board_size
+        self.order = self.rng.random((num_games, cells)).argsort(axis=1)
+        self.turn = np.zeros(num_games, dtype=np.intp)
+
+    def get_next_shots(self, active: np.ndarray) -> np.ndarray:
+        """Take the next unvisited cell from each game's shot order."""
+        turn = np.minimum(self.turn, self.order.shape[1] - 1)
+        cells = self.order[np.arange(self.num_games), turn]
+        return np.stack(np.divmod(cells, self.board_size), axis=1)
+
+    def register_results(self, shots: np.ndarray, results: np.ndarray, active: np.ndarray,
+                         sunk: Optional[np.ndarray] = None):
+        """Advance the running games along their shot order."""
+        self.turn += active
+
+
+class BatchSimulator:
+    """Plays many games at once on boards stored as a single NumPy array."""
+
+    def __init__(self, boards: np.ndarray):
+        """
+        Initialize the simulator.
+
+        Args:
+            boards: (N, size, size) integer array holding the index of the ship
+                in each cell, or -1 for water
+        """
+        self.boards = boards
+        self.num_games, self.size, _ = boards.shape
+        self.shots = np.zeros(boards.shape, dtype=bool)
+        self.remaining = (boards >= 0).sum(axis=(1, 2))
+        self.turns = np.zeros(self.num_games, dtype=np.intp)
+        self.active = self.remaining > 0
+
+        # Size and unhit cells of every ship, to announce sunk ships
+        flat = boards.reshape(self.num_games, -1).astype(np.intp)
+        num_ships = int(flat.max()) + 1 if flat.size else 0
+        self.ship_sizes = np.stack([(flat == ship).sum(axis=1) for ship in range(num_ships)], axis=1) \
+            if num_ships else np.zeros((self.num_games, 0), dtype=np.intp)
+        self.ship_remaining = self.ship_sizes.copy()
+        # Size of the ship sunk by the latest shot of each game, 0 if none
+        self.sunk = np.zeros(self.num_games, dtype=np.int8)
+
+    def step(self, shots: np.ndarray) -> np.ndarray:
+        """
+        Fire one shot in every running game.
+
+        Args:
+            shots: (N, 2) integer array of (row, col) targets
+
+        Returns:
+            np.ndarray: (N,) array of CellState values; UNKNOWN for finished
+                games. The size of the ship each shot sank is left in self.sunk.
+        """
+        games = np.flatnonzero(self.active)
+        rows, cols = shots[games, 0], shots[games, 1]
+
+        hit = self.boards[games, rows, cols] >= 0
+        fresh = ~self.shots[games, rows, cols]
+        self.shots[games, rows, cols] = True
+
+        self.remaining[games] -= hit & fresh
+        self.turns[games] += 1
+        self.active[games] = self.remaining[games] > 0
+
+        self.sunk[:] = 0
+        struck = games[hit & fresh]
+        ships = self.boards[struck, rows[hit & fresh], cols[hit & fresh]].astype(np.intp)
+        self.ship_remaining[struck, ships] -= 1
+        sinking = self.ship_remaining[struck, ships] == 0
+        self.sunk[struck[sinking]] = self.ship_sizes[struck[sinking], ships[sinking]]
+
+        results = np.full(self.num_games, CellState.UNKNOWN.value, dtype=np.int8)
+        results[games] = np.where(hit, CellState.HIT.value, CellState.MISS.value)
+        return results
+
+    def run(self, strategy: BatchStrategy) -> np.ndarray:
+        """
+        Play every game to completion.
+
+        Args:
+            strategy: The batch strategy choosing the shots
+
+        Returns:
+            np.ndarray: (N,) array of turns needed to sink every ship
+        """
+        strategy.reset(self.num_games)
+        while self.active.any():
+            active = self.active.copy()
+            shots = strategy.get_next_shots(active)
+            results = self.step(shots)
+            strategy.register_results(shots, results, active, self.sunk)
+        return self.turns
+
+
+def random_boards(num_games: int, board_size: int = 10, rng: Optional[np.random.Generator] = None,
+                  placement: str = "sequential") -> np.ndarray:
+    """
+    Build a stack of randomly placed boards.
+
+    Args:
+        num_games: Number of boards to build
+        board_size: Size of the board (default: 10x10)
+        rng: NumPy random generator (default: a freshly seeded one)
+        placement: Fleet placement mode, "sequential" or "uniform"
+
+    Returns:
+        np.ndarray: (N, size, size) int8 array of ship indices, -1 for water
+    """
+    return PlacementGenerator(board_size, seed=rng, mode=placement).boards(num_games)
+
+
+def simulate_batch(strategy_cls: Type[Strategy], num_games: int, board_size: int = 10,
+                   batch_size: int = 1000, rng: Optional[np.random.Generator] = None,
+                   placement: str = "sequential", corpus: Optional[str] = None) -> List[int]:
+    """
+    Simulate many games of a strategy, a batch at a time.
+
+    Args:
+        strategy_cls: The Strategy class to evaluate
+        num_games: Number of games to simulate
+        board_size: Size of the board (default: 10x10)
+        batch_size: Number of games played simultaneously
+        rng: NumPy random generator (default: a freshly seeded one)
+        placement: Fleet placement mode, "sequential" or "uniform"
+        corpus: Path of a board corpus to play the first num_games boards of
+
+    Returns:
+        List[int]: Turns needed to win each game
+
+    Raises:
+        ValueError: If the corpus holds fewer than num_games boards
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    if corpus is not None:
+        boards = open_corpus(corpus)
+        if num_games > len(boards):
+            raise ValueError(f"Corpus {corpus} only holds {len(boards)} boards")
+        board_size = boards.board_size
+    strategy = make_batch_strategy(strategy_cls, board_size, rng)
+    generator = PlacementGenerator(board_size, seed=rng, mode=placement)
+    turns: List[int] = []
+
+    for start in range(0, num_games, batch_size):
+        count = min(batch_size, num_games - start)
+        if corpus is not None:
+            grids = boards.grids(start, start + count)
+        else:
+            grids = generator.boards(count)
+        simulator = BatchSimulator(grids)
+        turns.extend(simulator.run(strategy).tolist())
+
+    return turns
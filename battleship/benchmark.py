@@ -1,61 +1,405 @@
-from battleship.strategy import RandomStrategy
+import math
+import random
+import time
+from typing import List, Optional, Tuple, Type
+
+from battleship.strategy import Strategy
 from battleship.core import Board
+from battleship.gamelog import GameRecorder
+from battleship.profiling import PhaseTimer, TimerCallback
+from battleship.registry import get_strategy
+from battleship.stats import BenchmarkResult, ComparisonResult, paired_difference, z_value
+
+
+def play_game(board : Board, strategy : Strategy, recorder : Optional[GameRecorder] = None,
+              timer : Optional[TimerCallback] = None) -> int:
+    """
+    Let a strategy shoot at a board until every ship is sunk.
+
+    Args:
+        board: A board with its ships already placed
+        strategy: The strategy to play, already reset
+        recorder: Log receiving every shot of the game (default: no recording)
+        timer: Callback receiving the duration of every phase of a turn,
+            e.g. a PhaseTimer (default: no timing)
 
-def benchmark_strategy(num_games : int = 100, strategy_name : str = "random"):
+    Returns:
+        int: Number of turns needed to sink every ship
+    """
+    if timer is not None:
+        return _play_game_timed(board, strategy, recorder, timer)
+
+    turn_count = 0
+    if recorder is not None:
+        recorder.start_game(board)
+
+    while True:
+        turn_count += 1
+
+        # Get next shot
+        shot = strategy.get_next_shot()
+
+        # Process shot
+        result, sunk = board.resolve_shot(shot)
+
+        # Register result, announcing sunk ships
+        strategy.register_result(shot, result, sunk)
+
+        if recorder is not None:
+            recorder.record_shot(shot, result)
+
+        # Check if game is over
+        if board.are_all_ships_sunk():
+            if recorder is not None:
+                recorder.end_game()
+            return turn_count
+
+
+def _play_game_timed(board : Board, strategy : Strategy, recorder : Optional[GameRecorder],
+                     timer : TimerCallback) -> int:
+    """play_game with every phase of a turn reported to a timer callback."""
+    clock = time.perf_counter_ns
+    turn_count = 0
+    if recorder is not None:
+        recorder.start_game(board)
+
+    while True:
+        turn_count += 1
+
+        start = clock()
+        shot = strategy.get_next_shot()
+        end = clock()
+        timer("get_next_shot", end - start)
+
+        start = clock()
+        result, sunk = board.resolve_shot(shot)
+        end = clock()
+        timer("receive_shot", end - start)
+
+        start = clock()
+        strategy.register_result(shot, result, sunk)
+        end = clock()
+        timer("register_result", end - start)
+
+        if recorder is not None:
+            recorder.record_shot(shot, result)
+
+        start = clock()
+        game_over = board.are_all_ships_sunk()
+        end = clock()
+        timer("are_all_ships_sunk", end - start)
+
+        if game_over:
+            if recorder is not None:
+                recorder.end_game()
+            return turn_count
+
+
+def game_rngs(seed : int, game_index : int) -> Tuple[random.Random, random.Random]:
+    """
+    Get the random number generators for one game of a seeded run.
+
+    Every game draws from its own streams derived from the master seed and its
+    index, so its outcome does not depend on which worker plays it.
+
+    Args:
+        seed: Master seed of the run
+        game_index: Index of the game within the run
+
+    Returns:
+        Tuple[random.Random, random.Random]: Generators for ship placement and for the strategy
+    """
+    return (random.Random(f"{seed}/{game_index}/board"),
+            random.Random(f"{seed}/{game_index}/strategy"))
+
+
+def simulate_games(strategy_cls : Type[Strategy], start : int, stop : int, seed : int,
+                   board_cls : Type[Board] = Board, board_size : int = 10,
+                   placement : str = "sequential", corpus : Optional[str] = None,
+                   recorder : Optional[GameRecorder] = None, timer : Optional[TimerCallback] = None) -> List[int]:
+    """
+    Play the games with indices [start, stop) of a seeded run.
+
+    Args:
+        strategy_cls: The Strategy class to evaluate
+        start: Index of the first game
+        stop: Index after the last game
+        seed: Master seed of the run
+        board_cls: Board implementation to simulate on
+        board_size: Size of the board (default: 10x10)
+        placement: Fleet placement mode, "sequential" or "uniform"
+        corpus: Path of a board corpus; game i plays board i of the corpus
+            instead of a random placement
+        recorder: Log receiving every shot of every game (default: no recording)
+        timer: Callback receiving the duration of every phase of every turn
+
+    Returns:
+        List[int]: Turns needed to win each game, in index order
+
+    Raises:
+        ValueError: If the corpus holds fewer than stop boards
+    """
+    boards = None
+    if corpus is not None:
+        # Imported here so plain benchmarks don't pay for NumPy
+        from battleship.corpus import open_corpus
+
+        boards = open_corpus(corpus)
+        if stop > len(boards):
+            raise ValueError(f"Corpus {corpus} only holds {len(boards)} boards")
+        board_size = boards.board_size
+
+    turns = []
+    strategy = strategy_cls(board_size)
+
+    for game_index in range(start, stop):
+        board_rng, strategy_rng = game_rngs(seed, game_index)
+
+        if boards is not None:
+            board = boards.board(game_index, board_cls)
+        else:
+            board = board_cls(board_size)
+            board.random_placement(board_rng, placement)
+
+        strategy.rng = strategy_rng
+        strategy.reset()
+
+        turns.append(play_game(board, strategy, recorder, timer))
+
+    return turns
+
+
+def run_games(strategy_cls : Type[Strategy], num_games : int, seed : int, workers : Optional[int] = None,
+              chunk_size : int = 100, board_cls : Type[Board] = Board, board_size : int = 10,
+              first_game : int = 0, placement : str = "sequential", corpus : Optional[str] = None,
+              recorder : Optional[GameRecorder] = None, timer : Optional[TimerCallback] = None) -> List[int]:
+    """
+    Play a seeded run of games, optionally spread over a process pool.
+
+    The games are cut into chunks of consecutive indices and the per-game
+    turn counts are merged back in index order, so the result only depends
+    on the seed and never on the number of workers.
+
+    Args:
+        strategy_cls: The Strategy class to evaluate
+        num_games: Number of games to simulate
+        seed: Master seed of the run
+        workers: Number of worker processes; None or 1 plays in this process
+        chunk_size: Number of games handed to a worker at a time
+        board_cls: Board implementation to simulate on
+        board_size: Size of the board (default: 10x10)
+        first_game: Index of the first game, to continue an earlier run
+        placement: Fleet placement mode, "sequential" or "uniform"
+        corpus: Path of a board corpus to play instead of random placements
+        recorder: Log receiving every shot; only supported in this process
+        timer: Callback receiving the duration of every phase; only supported in this process
+
+    Returns:
+        List[int]: Turns needed to win each game, in index order
+
+    Raises:
+        ValueError: If a recorder or timer is combined with worker processes,
+            or the corpus holds too few boards
+    """
+    end = first_game + num_games
+    if corpus is not None:
+        from battleship.corpus import open_corpus
+
+        # Check up front rather than failing in a worker halfway through the run
+        available = len(open_corpus(corpus))
+        if end > available:
+            raise ValueError(f"Corpus {corpus} only holds {available} boards")
+    if workers is None or workers <= 1:
+        return simulate_games(strategy_cls, first_game, end, seed, board_cls, board_size, placement, corpus,
+                              recorder, timer)
+    if recorder is not None or timer is not None:
+        raise ValueError("Games played in worker processes cannot be recorded or timed")
+
+    starts = range(first_game, end, chunk_size)
+    stops = [min(start + chunk_size, end) for start in starts]
+    count = len(starts)
+
+    # Imported here so runs in this process don't pay for multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    turns = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunks = executor.map(simulate_games, [strategy_cls] * count, starts, stops, [seed] * count,
+                              [board_cls] * count, [board_size] * count, [placement] * count, [corpus] * count)
+        for chunk in chunks:
+            turns.extend(chunk)
+
+    return turns
+
+
+def benchmark_strategy(num_games : int = 100, strategy_name : str = "random", board_cls : Type[Board] = Board,
+                       batch_size : Optional[int] = None, seed : Optional[int] = None,
+                       workers : Optional[int] = None, chunk_size : int = 100,
+                       placement : str = "sequential", corpus : Optional[str] = None,
+                       record : Optional[str] = None, timer : Optional[TimerCallback] = None,
+                       profile : Optional[str] = None) -> BenchmarkResult:
     """
     Benchmarks a strategy's board clearing abilities.
 
     Args:
         num_games: Number of games to simulate
         strategy: Name of the first strategy
+        board_cls: Board implementation to simulate on, e.g. BitBoard
+        batch_size: If set, play this many games at once on the NumPy batch
+            engine, in this process only
+        seed: Master seed making the run reproducible
+        workers: Number of worker processes to spread the games over
+        chunk_size: Number of games handed to a worker at a time
+        placement: Fleet placement mode; "uniform" makes every fleet layout equally likely
+        corpus: Path of a board corpus (see battleship.corpus) to play the
+            first num_games boards of, instead of random placements
+        record: Path of a game log (see battleship.gamelog) to append every
+            shot to; not supported with batch_size or worker processes
+        timer: Callback receiving the duration of every phase of every turn;
+            a PhaseTimer also gets its latency table printed. Not supported
+            with batch_size or worker processes
+        profile: Path to dump cProfile statistics of the run to (this process only)
+
+    Returns:
+        BenchmarkResult: Distribution of the turns needed to win
+
+    Raises:
+        ValueError: If recording or timing is combined with the batch engine or
+            worker processes, or the batch engine with worker processes
     """
-    strategies = {
-        "random" : RandomStrategy
-    }
-    strategy = strategies[strategy_name]()
+    strategy_cls = get_strategy(strategy_name)
+    if batch_size is not None and (workers or 1) > 1:
+        raise ValueError("The batch engine runs in this process only, so it can't be combined with workers")
+    if (record is not None or timer is not None) and (batch_size is not None or (workers or 1) > 1):
+        raise ValueError("Only games played one at a time in this process can be recorded or timed")
+    recorder = GameRecorder(record) if record is not None else None
+
+    profiler = None
+    if profile is not None:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
 
     # Initialize counter
     turns = []
 
     print(f"Simulating {num_games} games for strategy {strategy_name}...")
 
-    for i in range(num_games):
-        # Set up board
-        board = Board()
-        board.random_placement()
+    if batch_size is not None:
+        # Imported here so plain benchmarks don't pay for NumPy
+        import numpy as np
+        from battleship.batch import simulate_batch
 
-        # Reset strategy
-        strategy.reset()
-
-        # Play until one strategy wins
-        turn_count = 0
+        turns = simulate_batch(strategy_cls, num_games, batch_size=batch_size, rng=np.random.default_rng(seed),
+                               placement=placement, corpus=corpus)
+        print(f"Completed {num_games} games...")
+    elif seed is not None or workers is not None or corpus is not None:
+        if seed is None:
+            seed = random.randrange(2 ** 63)
+            print(f"Using seed {seed}")
 
-        while True:
-            turn_count += 1
+        turns = run_games(strategy_cls, num_games, seed, workers, chunk_size, board_cls,
+                          placement=placement, corpus=corpus, recorder=recorder, timer=timer)
+        print(f"Completed {num_games} games...")
+    else:
+        strategy = strategy_cls()
 
-            # Get next shot
-            shot = strategy.get_next_shot()
+        for i in range(num_games):
+            # Set up board
+            board = board_cls()
+            board.random_placement(mode=placement)
 
-            # Process shot
-            result = board.receive_shot(shot)
+            # Reset strategy
+            strategy.reset()
 
-            # Register result
-            strategy.register_result(shot, result)
+            # Play until one strategy wins
+            turns.append(play_game(board, strategy, recorder, timer))
 
-            # Check if game is over
-            if board.are_all_ships_sunk():
-                turns.append(turn_count)
-                break
+            # Print progress
+            if (i + 1) % 10 == 0:
+                print(f"Completed {i + 1} games...")
 
-        # Print progress
-        if (i + 1) % 10 == 0:
-            print(f"Completed {i + 1} games...")
+    if profiler is not None:
+        profiler.disable()
+        profiler.dump_stats(profile)
+    if recorder is not None:
+        recorder.close()
 
     # Print results
+    result = BenchmarkResult(strategy_name, turns)
     print("\nSimulation Results:")
-    avg_turns = sum(turns) / len(turns)
-    print(f"Average turns for {strategy_name} to win: {avg_turns:.1f}")
+    print(result.summary())
+
+    if isinstance(timer, PhaseTimer):
+        print("\nPhase timings:")
+        print(timer.summary())
+    if profiler is not None:
+        print(f"\nProfile written to {profile}, top functions by cumulative time:")
+        import pstats
+
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(15)
+
+    return result
+
+
+def compare_strategies(strategy_a : str, strategy_b : str, confidence : float = 0.95, min_games : int = 100,
+                       max_games : int = 100000, step : int = 100, seed : Optional[int] = None,
+                       workers : Optional[int] = None, board_size : int = 10,
+                       placement : str = "sequential", corpus : Optional[str] = None) -> ComparisonResult:
+    """
+    Compare two strategies, stopping as soon as their means are separated.
+
+    Both strategies play the same seeded boards, and the test runs on the
+    per-game difference in turns. After min_games and then every step games
+    the difference is checked against the requested confidence. The error
+    budget is split evenly over every check that could happen before
+    max_games (Bonferroni), so stopping early does not inflate the false
+    positive rate.
+
+    Args:
+        strategy_a: Name of the first strategy
+        strategy_b: Name of the second strategy
+        confidence: Required confidence that the better strategy is better (default: 0.95)
+        min_games: Games played before the first check
+        max_games: Games after which the comparison gives up undecided
+        step: Games played between checks
+        seed: Master seed making the run reproducible
+        workers: Number of worker processes to spread the games over
+        board_size: Size of the board (default: 10x10)
+        placement: Fleet placement mode, "sequential" or "uniform"
+        corpus: Path of a board corpus to play instead of random placements
+
+    Returns:
+        ComparisonResult: The turn distributions and the test outcome
+    """
+    if seed is None:
+        seed = random.randrange(2 ** 63)
+
+    checks = 1 + math.ceil(max(max_games - min_games, 0) / step)
+    threshold = z_value(1 - (1 - confidence) / checks)
+
+    turns_a : List[int] = []
+    turns_b : List[int] = []
+    batch = min_games
+
+    while True:
+        batch = min(batch, max_games - len(turns_a))
+        turns_a += run_games(get_strategy(strategy_a), batch, seed, workers, board_size=board_size,
+                             first_game=len(turns_a), placement=placement, corpus=corpus)
+        turns_b += run_games(get_strategy(strategy_b), batch, seed, workers, board_size=board_size,
+                             first_game=len(turns_b), placement=placement, corpus=corpus)
+
+        mean, stderr = paired_difference(turns_a, turns_b)
+        decided = abs(mean) > threshold * stderr
+        print(f"{len(turns_a)} games: mean difference {mean:+.2f} (std error {stderr:.3f})")
+
+        if decided or len(turns_a) >= max_games:
+            return ComparisonResult(BenchmarkResult(strategy_a, turns_a), BenchmarkResult(strategy_b, turns_b),
+                                    confidence, mean, stderr, decided)
+
+        batch = step
 
 
 if __name__ == "__main__":
-    benchmark_strategy()
\ No newline at end of file
+    benchmark_strategy()
@@ -0,0 +1,197 @@
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from battleship.microbatch import MoveBatcher
+from battleship.server import GameServer, MAX_LINE
+
+
+class GameClient:
+    """Client for GameServer speaking newline-delimited JSON, one request at a time."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Wrap an open connection; use GameClient.connect to open one.
+
+        Args:
+            reader: Stream reading from the server
+            writer: Stream writing to the server
+        """
+        self.reader = reader
+        self.writer = writer
+        self.request_ids = itertools.count(1)
+
+    @classmethod
+    async def connect(cls, host: str = "127.0.0.1", port: int = 8765) -> "GameClient":
+        """
+        Connect to a server.
+
+        Args:
+            host: Host of the server
+            port: Port of the server
+
+        Returns:
+            GameClient: The connected client
+        """
+        reader, writer = await asyncio.open_connection(host, port, limit=MAX_LINE)
+        return cls(reader, writer)
+
+    async def request(self, op: str, **arguments) -> Dict[str, Any]:
+        """
+        Send a request and wait for its response.
+
+        Args:
+            op: Operation name
+            **arguments: Operation arguments
+
+        Returns:
+            Dict[str, Any]: The response
+
+        Raises:
+            RuntimeError: If the server answered with an error
+        """
+        request = {"op": op, "id": next(self.request_ids), **arguments}
+        self.writer.write(json.dumps(request).encode() + b"\n")
+        await self.writer.drain()
+
+        line = await self.reader.readline()
+        if not line:
+            raise ConnectionError("Server closed the connection")
+        response = json.loads(line)
+        if "error" in response:
+            raise RuntimeError(response["error"])
+        return response
+
+    async def new_game(self, strategy: str = "random", board_size: int = 10) -> str:
+        """Start a game against a strategy and return its session id."""
+        return (await self.request("new", strategy=strategy, board_size=board_size))["session"]
+
+    async def shoot(self, session: str, row: int, col: int) -> Dict[str, Any]:
+        """Play one turn of a game."""
+        return await self.request("shoot", session=session, row=row, col=col)
+
+    async def close_game(self, session: str) -> bool:
+        """End a game on the server."""
+        return (await self.request("close", session=session))["closed"]
+
+    async def close(self):
+        """Close the connection."""
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+@dataclass
+class LoadTestResult:
+    """Throughput and latency of a load test."""
+    games: int
+    elapsed: float
+    latencies: List[float] = field(default_factory=list)
+
+    @property
+    def turns_per_second(self) -> float:
+        """Turns served per second of wall clock time."""
+        return len(self.latencies) / self.elapsed if self.elapsed else 0.0
+
+    def percentile(self, p: float) -> float:
+        """Turn latency percentile in seconds."""
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(int(len(ordered) * p / 100), len(ordered) - 1)]
+
+    def summary(self) -> str:
+        """Format the results as a short report."""
+        return (f"{self.games} games, {len(self.latencies)} turns in {self.elapsed:.2f}s "
+                f"({self.turns_per_second:.0f} turns/s)\n"
+                f"  turn latency p50: {self.percentile(50) * 1e3:.2f} ms, "
+                f"p99: {self.percentile(99) * 1e3:.2f} ms, max: {self.percentile(100) * 1e3:.2f} ms")
+
+
+async def _play(client: GameClient, strategy: str, board_size: int, rng: random.Random,
+                latencies: List[float]):
+    """Play one game with random player shots, recording every turn's latency."""
+    session = await client.new_game(strategy, board_size)
+    cells = [(row, col) for row in range(board_size) for col in range(board_size)]
+    rng.shuffle(cells)
+
+    for row, col in cells:
+        start = time.perf_counter()
+        turn = await client.shoot(session, row, col)
+        latencies.append(time.perf_counter() - start)
+        if turn["game_over"]:
+            break
+
+    await client.close_game(session)
+
+
+async def load_test(host: Optional[str] = None, port: int = 8765, games: int = 1000, connections: int = 100,
+                    strategy: str = "random", board_size: int = 10, seed: Optional[int] = None,
+                    batch_window: Optional[float] = None) -> LoadTestResult:
+    """
+    Play many concurrent games against a server and measure it.
+
+    Args:
+        host: Host of the server; None starts one in this process on a free port
+        port: Port of the server
+        games: Number of games to play
+        connections: Games played at once, each over its own connection
+        strategy: Strategy the server plays
+        board_size: Size of the board
+        seed: Seed of the player's shots
+        batch_window: Move batching window of the local server (default: no batching)
+
+    Returns:
+        LoadTestResult: Throughput and turn latencies
+    """
+    server = None
+    if host is None:
+        batcher = MoveBatcher(batch_window) if batch_window is not None else None
+        server = GameServer(port=0, batcher=batcher)
+        await server.start()
+        host, port = server.host, server.port
+
+    rng = random.Random(seed)
+    latencies: List[float] = []
+    pending = iter(range(games))
+
+    async def worker():
+        client = await GameClient.connect(host, port)
+        worker_rng = random.Random(rng.getrandbits(64))
+        for _ in pending:
+            await _play(client, strategy, board_size, worker_rng, latencies)
+        await client.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(connections, games))))
+    elapsed = time.perf_counter() - start
+
+    if server is not None:
+        await server.close()
+    return LoadTestResult(games, elapsed, latencies)
+
+
+def main():
+    """Run a load test from the command line."""
+    parser = argparse.ArgumentParser(description="Load test a Battleship game server.")
+    parser.add_argument("--host", default=None, help="Server host (default: start a local server)")
+    parser.add_argument("--port", type=int, default=8765, help="Server port (default: 8765)")
+    parser.add_argument("--games", type=int, default=1000, help="Number of games (default: 1000)")
+    parser.add_argument("--connections", type=int, default=100, help="Concurrent games (default: 100)")
+    parser.add_argument("--strategy", default="random", help="Strategy the server plays (default: random)")
+    parser.add_argument("--seed", type=int, default=None, help="Seed of the player's shots")
+    parser.add_argument("--batch-window", type=float, default=None,
+                        help="Batch AI moves of the local server within this many seconds")
+    args = parser.parse_args()
+
+    result = asyncio.run(load_test(args.host, args.port, args.games, args.connections, args.strategy,
+                                   seed=args.seed, batch_window=args.batch_window))
+    print(result.summary())
+
+
+if __name__ == "__main__":
+    main()
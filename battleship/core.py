@@ -1,4 +1,5 @@
 import random
+import struct
 from enum import Enum
 from typing import Dict, List, Optional, Set, Tuple
 
@@ -19,15 +20,46 @@ class ShipType(Enum):
     DESTROYER = 2
 
 
+# Ships each player places, in placement order
+STANDARD_FLEET: Tuple[ShipType, ...] = (
+    ShipType.CARRIER,
+    ShipType.BATTLESHIP,
+    ShipType.CRUISER,
+    ShipType.SUBMARINE,
+    ShipType.DESTROYER
+)
+
+
 class Orientation(Enum):
     """Ship orientation."""
     HORIZONTAL = 0
     VERTICAL = 1
 
 
+# Ship in the binary formats: size (u8), orientation (u8), start cell (u16)
+SHIP_RECORD = struct.Struct("<BBH")
+
+# Board snapshot layout (little endian):
+#   header: version (u8), board size (u16), number of ships (u8)
+#   ships:  one SHIP_RECORD per ship, in placement order
+#   shots:  hit mask, then miss mask, (size * size + 7) // 8 bytes each,
+#           bit row * size + col set for every cell shot
+BOARD_VERSION = 1
+BOARD_HEADER = struct.Struct("<BHB")
+
+
+def _bit_indices(mask: int) -> List[int]:
+    """Get the indices of the set bits of a mask, lowest first."""
+    # Scanning the binary string beats peeling off bits for dense masks
+    return [index for index, bit in enumerate(bin(mask)[:1:-1]) if bit == "1"]
+
+
 class Ship:
     """Represents a ship in the game."""
 
+    __slots__ = ("ship_type", "size", "orientation", "start_position",
+                 "positions", "position_set", "hit_positions", "hit_count")
+
     def __init__(self, ship_type: ShipType, orientation: Orientation, start_position: Tuple[int, int]):
         """
         Initialize a ship.
@@ -41,24 +73,25 @@ class Ship:
         self.size = ship_type.value
         self.orientation = orientation
         self.start_position = start_position
+
+        # Occupied cells never change, so compute them once
+        row, col = start_position
+        if orientation == Orientation.HORIZONTAL:
+            self.positions = tuple((row, col + i) for i in range(self.size))
+        else:  # VERTICAL
+            self.positions = tuple((row + i, col) for i in range(self.size))
+        self.position_set = frozenset(self.positions)
+
         self.hit_positions: Set[Tuple[int, int]] = set()
+        self.hit_count = 0
 
     def is_sunk(self) -> bool:
         """Check if the ship is sunk (all positions hit)."""
-        return len(self.hit_positions) == self.size
+        return self.hit_count == self.size
 
     def get_positions(self) -> List[Tuple[int, int]]:
         """Get all positions occupied by the ship."""
-        row, col = self.start_position
-        positions = []
-
-        for i in range(self.size):
-            if self.orientation == Orientation.HORIZONTAL:
-                positions.append((row, col + i))
-            else:  # VERTICAL
-                positions.append((row + i, col))
-
-        return positions
+        return list(self.positions)
 
     def register_hit(self, position: Tuple[int, int]) -> bool:
         """
@@ -70,8 +103,9 @@ class Ship:
         Returns:
             bool: True if the hit was successful, False if already hit
         """
-        if position in self.get_positions() and position not in self.hit_positions:
+        if position in self.position_set and position not in self.hit_positions:
             self.hit_positions.add(position)
+            self.hit_count += 1
             return True
         return False
 
@@ -89,6 +123,20 @@ class Board:
         self.size = size
         self.ships: List[Ship] = []
         self.shots: Dict[Tuple[int, int], CellState] = {}
+        # Dense cell -> ship index lookup (row * size + col), -1 for water
+        self.grid: List[int] = [-1] * (size * size)
+
+    def _cell_index(self, position: Tuple[int, int]) -> int:
+        """Get the grid index of a position, or -1 if it is off the board."""
+        row, col = position
+        if row < 0 or row >= self.size or col < 0 or col >= self.size:
+            return -1
+        return row * self.size + col
+
+    def clear_ships(self):
+        """Remove all ships from the board."""
+        self.ships = []
+        self.grid = [-1] * (self.size * self.size)
 
     def place_ship(self, ship: Ship) -> bool:
         """
@@ -100,19 +148,17 @@ class Board:
         Returns:
             bool: True if the ship was successfully placed, False otherwise
         """
-        # Check if ship is within board boundaries
-        for row, col in ship.get_positions():
-            if row < 0 or row >= self.size or col < 0 or col >= self.size:
-                return False
+        indices = [self._cell_index(position) for position in ship.positions]
 
-        # Check if ship overlaps with any existing ships
-        for existing_ship in self.ships:
-            existing_positions = set(existing_ship.get_positions())
-            new_positions = set(ship.get_positions())
-            if existing_positions.intersection(new_positions):
+        # Check if ship is within board boundaries and overlaps no existing ship
+        for index in indices:
+            if index < 0 or self.grid[index] >= 0:
                 return False
 
         # Place the ship
+        ship_index = len(self.ships)
+        for index in indices:
+            self.grid[index] = ship_index
         self.ships.append(ship)
         return True
 
@@ -126,17 +172,32 @@ class Board:
         Returns:
             CellState: The result of the shot (MISS or HIT)
         """
+        return self.resolve_shot(position)[0]
+
+    def resolve_shot(self, position: Tuple[int, int]) -> Tuple[CellState, Optional[ShipType]]:
+        """
+        Process a shot at the given position, announcing the ship it sinks.
+
+        Args:
+            position: (row, col) tuple indicating the shot position
+
+        Returns:
+            Tuple[CellState, Optional[ShipType]]: The result of the shot (MISS
+                or HIT) and the type of the ship it sank, if any. Only the shot
+                that takes the last cell of a ship announces it.
+        """
         if position in self.shots:
-            return self.shots[position]  # Shot already taken at this position
+            return self.shots[position], None  # Shot already taken at this position
 
-        for ship in self.ships:
-            if position in ship.get_positions():
-                ship.register_hit(position)
-                self.shots[position] = CellState.HIT
-                return CellState.HIT
+        index = self._cell_index(position)
+        if index >= 0 and self.grid[index] >= 0:
+            ship = self.ships[self.grid[index]]
+            ship.register_hit(position)
+            self.shots[position] = CellState.HIT
+            return CellState.HIT, ship.ship_type if ship.hit_count == ship.size else None
 
         self.shots[position] = CellState.MISS
-        return CellState.MISS
+        return CellState.MISS, None
 
     def are_all_ships_sunk(self) -> bool:
         """Check if all ships on the board are sunk."""
@@ -144,46 +205,123 @@ class Board:
 
     def get_ship_at_position(self, position: Tuple[int, int]) -> Optional[Ship]:
         """Get the ship at a specific position, if any."""
+        index = self._cell_index(position)
+        if index < 0 or self.grid[index] < 0:
+            return None
+        return self.ships[self.grid[index]]
+
+    def get_cell_state(self, position: Tuple[int, int]) -> CellState:
+        """Get the shot state of a specific position."""
+        return self.shots.get(position, CellState.UNKNOWN)
+
+    def _shot_masks(self) -> Tuple[int, int]:
+        """Get the hits and misses on the board as bitmasks."""
+        size = self.size
+        hit_mask = miss_mask = 0
+        for (row, col), state in self.shots.items():
+            if 0 <= row < size and 0 <= col < size:
+                if state == CellState.HIT:
+                    hit_mask |= 1 << (row * size + col)
+                else:
+                    miss_mask |= 1 << (row * size + col)
+        return hit_mask, miss_mask
+
+    def _restore_shots(self, hit_mask: int, miss_mask: int):
+        """Mark the cells of two bitmasks as hit and missed on a board without shots."""
+        for index in _bit_indices(miss_mask):
+            self.shots[divmod(index, self.size)] = CellState.MISS
+        for index in _bit_indices(hit_mask):
+            if self.grid[index] < 0:
+                raise ValueError("Board snapshot has a hit on water")
+            position = divmod(index, self.size)
+            self.ships[self.grid[index]].register_hit(position)
+            self.shots[position] = CellState.HIT
+
+    def to_bytes(self) -> bytes:
+        """
+        Serialize the fleet layout and shots of the board.
+
+        The layout is fixed for a given board size and number of ships (see
+        BOARD_HEADER); the order in which the shots were taken is not kept.
+
+        Returns:
+            bytes: The snapshot, which any Board class can restore with from_bytes
+        """
+        size = self.size
+        length = (size * size + 7) // 8
+        hit_mask, miss_mask = self._shot_masks()
+
+        parts = [BOARD_HEADER.pack(BOARD_VERSION, size, len(self.ships))]
         for ship in self.ships:
-            if position in ship.get_positions():
-                return ship
-        return None
+            row, col = ship.start_position
+            parts.append(SHIP_RECORD.pack(ship.size, ship.orientation.value, row * size + col))
+        parts.append(hit_mask.to_bytes(length, "little"))
+        parts.append(miss_mask.to_bytes(length, "little"))
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Board":
+        """
+        Restore a board serialized with to_bytes.
 
-    def random_placement(self) -> bool:
+        Args:
+            data: The snapshot
+
+        Returns:
+            Board: A board of this class with the same ships and shots
+
+        Raises:
+            ValueError: If the data is not a valid snapshot of a supported version
+        """
+        if len(data) < BOARD_HEADER.size:
+            raise ValueError("Truncated board snapshot")
+        version, size, num_ships = BOARD_HEADER.unpack_from(data)
+        if version != BOARD_VERSION:
+            raise ValueError(f"Unsupported board snapshot version {version}")
+        length = (size * size + 7) // 8
+        offset = BOARD_HEADER.size + num_ships * SHIP_RECORD.size
+        if len(data) != offset + 2 * length:
+            raise ValueError("Board snapshot has the wrong length")
+
+        board = cls(size)
+        for ship_size, orientation, start in SHIP_RECORD.iter_unpack(data[BOARD_HEADER.size:offset]):
+            if not board.place_ship(Ship(ShipType(ship_size), Orientation(orientation), divmod(start, size))):
+                raise ValueError("Board snapshot has overlapping or off-board ships")
+
+        hit_mask = int.from_bytes(data[offset:offset + length], "little")
+        miss_mask = int.from_bytes(data[offset + length:], "little")
+        if hit_mask & miss_mask or (hit_mask | miss_mask) >> (size * size):
+            raise ValueError("Board snapshot has invalid shots")
+        board._restore_shots(hit_mask, miss_mask)
+        return board
+
+    def random_placement(self, rng: Optional[random.Random] = None, mode: str = "sequential") -> bool:
         """
         Place all standard ships randomly on the board.
 
+        By default each ship is drawn uniformly from the placements left free
+        by the ships placed before it. With mode "uniform" every complete
+        fleet layout is equally likely instead.
+
+        Args:
+            rng: Random number generator to draw from (default: the global random module)
+            mode: "sequential" or "uniform" (default: "sequential")
+
         Returns:
-            bool: True if all ships were successfully placed, False otherwise
-        """
-        self.ships = []  # Clear existing ships
-        ship_types = [
-            ShipType.CARRIER,
-            ShipType.BATTLESHIP,
-            ShipType.CRUISER,
-            ShipType.SUBMARINE,
-            ShipType.DESTROYER
-        ]
-
-        for ship_type in ship_types:
-            # Try to place the ship up to 100 times
-            for _ in range(100):
-                orientation = random.choice(list(Orientation))
-
-                if orientation == Orientation.HORIZONTAL:
-                    row = random.randint(0, self.size - 1)
-                    col = random.randint(0, self.size - ship_type.value)
-                else:  # VERTICAL
-                    row = random.randint(0, self.size - ship_type.value)
-                    col = random.randint(0, self.size - 1)
-
-                ship = Ship(ship_type, orientation, (row, col))
-                if self.place_ship(ship):
-                    break
-            else:
-                # Failed to place a ship after 100 attempts
-                return False
+            bool: True if all ships were successfully placed, False if the fleet doesn't fit
+        """
+        # Imported here because battleship.placements builds on this module
+        from battleship.placements import get_placement_table
 
+        table = get_placement_table(self.size, STANDARD_FLEET)
+        placements = table.random_layout(rng, mode)
+
+        self.clear_ships()
+        if placements is None:
+            return False
+
+        for placement in placements:
+            self.place_ship(table.to_ship(placement))
         return True
 
     def print_board(self, show_ships: bool = False):
@@ -204,15 +342,164 @@ class Board:
 
             for col in range(self.size):
                 position = (row, col)
+                state = self.get_cell_state(position)
 
-                if position in self.shots:
-                    if self.shots[position] == CellState.HIT:
-                        print(" X", end="")
-                    else:  # MISS
-                        print(" O", end="")
-                elif show_ships and any(position in ship.get_positions() for ship in self.ships):
+                if state == CellState.HIT:
+                    print(" X", end="")
+                elif state == CellState.MISS:
+                    print(" O", end="")
+                elif show_ships and self.get_ship_at_position(position) is not None:
                     print(" S", end="")
                 else:
                     print(" ·", end="")
 
             print()
+
+
+class BitBoard(Board):
+    """
+    A Board whose ship occupancy, hits and misses are stored as integer bitmasks.
+
+    Cell (row, col) maps to bit ``row * size + col``, so shot resolution, sunk
+    checks and are_all_ships_sunk are a handful of bit operations instead of
+    scans over every ship's positions. The struck ship is found through the
+    same dense cell -> ship index as Board uses. The public API matches Board,
+    including off-board shots, which count as recorded misses.
+    """
+
+    def __init__(self, size: int = 10):
+        """
+        Initialize a board.
+
+        Args:
+            size: Size of the board (default: 10x10)
+        """
+        self.size = size
+        self.ships: List[Ship] = []
+        self.occupied_mask = 0
+        self.hit_mask = 0
+        self.miss_mask = 0
+        self.ship_masks: List[int] = []
+        # Dense cell -> ship index lookup (row * size + col), -1 for water
+        self.grid: List[int] = [-1] * (size * size)
+        # Shots outside the board have no bit, so they are kept apart
+        self.off_board_shots: Set[Tuple[int, int]] = set()
+
+    @property
+    def shots(self) -> Dict[Tuple[int, int], CellState]:
+        """All shots taken so far, rebuilt from the hit and miss masks."""
+        shots = dict.fromkeys(self.off_board_shots, CellState.MISS)
+        for index in range(self.size * self.size):
+            bit = 1 << index
+            if self.hit_mask & bit:
+                shots[divmod(index, self.size)] = CellState.HIT
+            elif self.miss_mask & bit:
+                shots[divmod(index, self.size)] = CellState.MISS
+        return shots
+
+    def _bit(self, position: Tuple[int, int]) -> int:
+        """Get the bit for a position, or 0 if it is off the board."""
+        index = self._cell_index(position)
+        return 1 << index if index >= 0 else 0
+
+    def place_ship(self, ship: Ship) -> bool:
+        """
+        Place a ship on the board.
+
+        Args:
+            ship: The ship to place
+
+        Returns:
+            bool: True if the ship was successfully placed, False otherwise
+        """
+        mask = 0
+        for position in ship.positions:
+            bit = self._bit(position)
+            if not bit:
+                return False
+            mask |= bit
+
+        if self.occupied_mask & mask:
+            return False
+
+        ship_index = len(self.ships)
+        for position in ship.positions:
+            self.grid[self._cell_index(position)] = ship_index
+        self.ships.append(ship)
+        self.ship_masks.append(mask)
+        self.occupied_mask |= mask
+        return True
+
+    def resolve_shot(self, position: Tuple[int, int]) -> Tuple[CellState, Optional[ShipType]]:
+        """
+        Process a shot at the given position, announcing the ship it sinks.
+
+        Args:
+            position: (row, col) tuple indicating the shot position
+
+        Returns:
+            Tuple[CellState, Optional[ShipType]]: The result of the shot (MISS
+                or HIT) and the type of the ship it sank, if any
+        """
+        index = self._cell_index(position)
+        if index < 0:
+            self.off_board_shots.add(position)
+            return CellState.MISS, None
+
+        bit = 1 << index
+        if self.hit_mask & bit:
+            return CellState.HIT, None  # Shot already taken at this position
+        if self.miss_mask & bit:
+            return CellState.MISS, None
+
+        ship_index = self.grid[index]
+        if ship_index >= 0:
+            self.hit_mask |= bit
+            ship = self.ships[ship_index]
+            ship.register_hit(position)
+            mask = self.ship_masks[ship_index]
+            return CellState.HIT, ship.ship_type if self.hit_mask & mask == mask else None
+
+        self.miss_mask |= bit
+        return CellState.MISS, None
+
+    def is_ship_sunk(self, index: int) -> bool:
+        """Check if the ship at the given index in self.ships is sunk."""
+        mask = self.ship_masks[index]
+        return self.hit_mask & mask == mask
+
+    def are_all_ships_sunk(self) -> bool:
+        """Check if all ships on the board are sunk."""
+        return self.occupied_mask & ~self.hit_mask == 0
+
+    def get_cell_state(self, position: Tuple[int, int]) -> CellState:
+        """Get the shot state of a specific position."""
+        bit = self._bit(position)
+        if not bit:
+            return CellState.MISS if position in self.off_board_shots else CellState.UNKNOWN
+        if self.hit_mask & bit:
+            return CellState.HIT
+        if self.miss_mask & bit:
+            return CellState.MISS
+        return CellState.UNKNOWN
+
+    def clear_ships(self):
+        """Remove all ships from the board."""
+        self.ships = []
+        self.ship_masks = []
+        self.occupied_mask = 0
+        self.grid = [-1] * (self.size * self.size)
+
+    def _shot_masks(self) -> Tuple[int, int]:
+        """Get the hits and misses on the board as bitmasks."""
+        return self.hit_mask, self.miss_mask
+
+    def _restore_shots(self, hit_mask: int, miss_mask: int):
+        """Mark the cells of two bitmasks as hit and missed on a board without shots."""
+        if hit_mask & ~self.occupied_mask:
+            raise ValueError("Board snapshot has a hit on water")
+        self.hit_mask = hit_mask
+        self.miss_mask = miss_mask
+        for ship, mask in zip(self.ships, self.ship_masks):
+            for index in _bit_indices(mask & hit_mask):
+                ship.register_hit(divmod(index, self.size))
@@ -0,0 +1,216 @@
+import os
+import struct
+from functools import lru_cache
+from typing import Iterator, Optional, Sequence, Type, Union
+
+import numpy as np
+
+from battleship.core import Board, ShipType, STANDARD_FLEET
+from battleship.generator import PlacementGenerator
+from battleship.placements import get_placement_table
+
+# File layout (little endian):
+#   header:  magic (8s), version (u16), board size (u16), ships (u16), 0 (u16), boards (u64)
+#   fleet:   size of each ship (u8 each), zero padded to a multiple of 8 bytes
+#   records: per board, the occupancy bit-packed row by row (ceil(size^2 / 8) bytes)
+#            followed by the placement index of each ship (u16 each)
+MAGIC = b"BSCORPUS"
+VERSION = 1
+HEADER = struct.Struct("<8sHHHHQ")
+
+
+def record_dtype(board_size: int, num_ships: int) -> np.dtype:
+    """
+    Get the NumPy record type of one board in a corpus file.
+
+    Args:
+        board_size: Size of the board
+        num_ships: Number of ships in the fleet
+
+    Returns:
+        np.dtype: Structured type with "occupancy" and "placements" fields
+    """
+    return np.dtype([
+        ("occupancy", np.uint8, ((board_size * board_size + 7) // 8,)),
+        ("placements", "<u2", (num_ships,)),
+    ])
+
+
+def _data_offset(num_ships: int) -> int:
+    """Byte offset of the first record."""
+    return HEADER.size + (num_ships + 7) // 8 * 8
+
+
+class CorpusWriter:
+    """
+    Appends fleet layouts to a corpus file.
+
+    The layouts are written to a temporary file next to the target, which
+    replaces it on close, so corpora mapped by readers are never truncated
+    under them.
+    """
+
+    def __init__(self, path: str, board_size: int = 10, fleet: Sequence[ShipType] = STANDARD_FLEET):
+        """
+        Create the corpus file, replacing any existing one.
+
+        Args:
+            path: Path of the corpus file
+            board_size: Size of the board (default: 10x10)
+            fleet: Ships of every layout (default: the standard fleet)
+
+        Raises:
+            ValueError: If the placement indices don't fit the u16 records
+        """
+        self.board_size = board_size
+        self.fleet = tuple(fleet)
+        self.table = get_placement_table(board_size, self.fleet)
+        if len(self.table) > 1 << 16:
+            raise ValueError(f"{len(self.table)} placements don't fit the corpus format's 16 bit indices")
+        self.dtype = record_dtype(board_size, len(self.fleet))
+        self.count = 0
+
+        self.path = path
+        self.temp_path = f"{path}.{os.getpid()}.tmp"
+        self.file = open(self.temp_path, "wb")
+        self._write_header()
+        sizes = bytes(ship_type.value for ship_type in self.fleet)
+        self.file.write(sizes.ljust(_data_offset(len(self.fleet)) - HEADER.size, b"\0"))
+
+    def _write_header(self):
+        """Write the header at the start of the file."""
+        self.file.write(HEADER.pack(MAGIC, VERSION, self.board_size, len(self.fleet), 0, self.count))
+
+    def append(self, placements: np.ndarray):
+        """
+        Append fleet layouts.
+
+        Args:
+            placements: (N, len(fleet)) placement index of each ship, as
+                returned by PlacementGenerator.fleets
+        """
+        occupancy = self.table.to_grids(placements).reshape(len(placements), -1) >= 0
+        records = np.empty(len(placements), dtype=self.dtype)
+        records["occupancy"] = np.packbits(occupancy, axis=1)
+        records["placements"] = placements
+        self.file.write(records.tobytes())
+        self.count += len(placements)
+
+    def close(self):
+        """Record the number of boards in the header and move the file into place."""
+        self.file.seek(0)
+        self._write_header()
+        self.file.close()
+        os.replace(self.temp_path, self.path)
+
+    def discard(self):
+        """Drop the partly written file, leaving any existing corpus untouched."""
+        self.file.close()
+        os.remove(self.temp_path)
+
+    def __enter__(self) -> "CorpusWriter":
+        return self
+
+    def __exit__(self, exc_type, *exc_info):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+
+def write_corpus(path: str, count: int, board_size: int = 10, seed: Union[None, int, np.random.Generator] = None,
+                 placement: str = "sequential", chunk_size: int = 1000000):
+    """
+    Generate random fleet layouts into a corpus file.
+
+    Args:
+        path: Path of the corpus file
+        count: Number of boards
+        board_size: Size of the board (default: 10x10)
+        seed: Seed or NumPy random generator making the corpus reproducible
+        placement: Fleet placement mode, "sequential" or "uniform"
+        chunk_size: Boards generated in memory at a time
+    """
+    generator = PlacementGenerator(board_size, seed=seed, mode=placement)
+    with CorpusWriter(path, board_size) as writer:
+        for start in range(0, count, chunk_size):
+            writer.append(generator.fleets(min(chunk_size, count - start)))
+
+
+class Corpus:
+    """Read-only, memory-mapped view of a corpus file."""
+
+    def __init__(self, path: str):
+        """
+        Open a corpus file.
+
+        Args:
+            path: Path of the corpus file
+
+        Raises:
+            ValueError: If the file is not a corpus file of a supported version
+        """
+        with open(path, "rb") as file:
+            magic, version, board_size, num_ships, _, count = HEADER.unpack(file.read(HEADER.size))
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a battleship corpus file")
+            if version != VERSION:
+                raise ValueError(f"Unsupported corpus version {version} in {path}")
+            sizes = file.read(num_ships)
+
+        self.path = path
+        self.board_size = board_size
+        self.fleet = tuple(ShipType(size) for size in sizes)
+        self.table = get_placement_table(board_size, self.fleet)
+        self.records = np.memmap(path, dtype=record_dtype(board_size, num_ships), mode="r",
+                                 offset=_data_offset(num_ships), shape=(count,))
+
+    def __len__(self) -> int:
+        """Number of boards in the corpus."""
+        return len(self.records)
+
+    def placements(self, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """(N, len(fleet)) placement index of each ship of boards [start, stop)."""
+        return self.records["placements"][start:stop].astype(np.intp)
+
+    def occupancy(self, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """(N, size, size) boolean occupancy of boards [start, stop)."""
+        bits = np.unpackbits(self.records["occupancy"][start:stop], axis=1, count=self.table.num_cells)
+        return bits.astype(bool).reshape(-1, self.board_size, self.board_size)
+
+    def grids(self, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """(N, size, size) int8 ship index of every cell of boards [start, stop), -1 for water."""
+        return self.table.to_grids(self.placements(start, stop))
+
+    def board(self, index: int, board_cls: Type[Board] = Board) -> Board:
+        """
+        Build the Board stored at an index.
+
+        Args:
+            index: Index of the board in the corpus
+            board_cls: Board implementation to build
+
+        Returns:
+            Board: A board with its ships placed and no shots taken
+        """
+        board = board_cls(self.board_size)
+        for placement in self.records["placements"][index]:
+            board.place_ship(self.table.to_ship(int(placement)))
+        return board
+
+    def boards(self, start: int = 0, stop: Optional[int] = None, board_cls: Type[Board] = Board) -> Iterator[Board]:
+        """Iterate over the Boards [start, stop) of the corpus."""
+        for index in range(start, len(self) if stop is None else stop):
+            yield self.board(index, board_cls)
+
+
+def open_corpus(path: str) -> Corpus:
+    """Open a corpus file once per process and reuse the mapping until the file is replaced."""
+    stat = os.stat(path)
+    return _open_corpus(path, stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+@lru_cache(maxsize=8)
+def _open_corpus(path: str, mtime_ns: int, size: int, inode: int) -> Corpus:
+    """Open a corpus file, cached on its identity so a rewritten file is mapped again."""
+    return Corpus(path)
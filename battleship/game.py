@@ -1,25 +1,54 @@
-from typing import Dict, Tuple, Optional
-from battleship.core import Board, CellState
+import random
+import struct
+from typing import Dict, Tuple, Optional, Type
+from battleship.core import Board, CellState, ShipType
+from battleship.gamelog import GameRecorder
+from battleship.profiling import TimerCallback, timed
+from battleship.registry import get_strategy, strategy_name
 from battleship.strategy import Strategy, RandomStrategy
 
+# Game snapshot layout (little endian):
+#   header:   version (u8), flags (u8), turn count (u32), size of the ship
+#             sunk by the latest player and AI shot (u8 each, 0 for none),
+#             length of the strategy name (u8)
+#             flags: bit 0 game over, bits 1-2 winner (0 none, 1 player, 2 AI)
+#   strategy: registry name of the AI strategy (UTF-8)
+#   parts:    lengths (u32) of the player's board, the AI's board and the AI
+#             strategy, followed by their to_bytes snapshots
+GAME_VERSION = 1
+GAME_HEADER = struct.Struct("<BBIBBB")
+GAME_PARTS = struct.Struct("<III")
+WINNERS = (None, "Player", "AI")
+
 
 class Game:
     """Manages a game of Battleship with customizable strategies."""
 
-    def __init__(self, board_size: int = 10, ai_strategy: Optional[Strategy] = None):
+    def __init__(self, board_size: int = 10, ai_strategy: Optional[Strategy] = None,
+                 board_cls: Type[Board] = Board, recorder: Optional[GameRecorder] = None,
+                 timer: Optional[TimerCallback] = None):
         """
         Initialize a game.
 
         Args:
             board_size: Size of the game board (default: 10x10)
             ai_strategy: Strategy for the AI player (default: RandomStrategy)
+            board_cls: Board implementation to use, e.g. BitBoard (default: Board)
+            recorder: Log receiving the AI's shots at the player's board (default: no recording)
+            timer: Callback receiving the duration of every phase of a turn,
+                e.g. a PhaseTimer (default: no timing)
         """
-        self.player_board = Board(board_size)
-        self.ai_board = Board(board_size)
+        self.player_board = board_cls(board_size)
+        self.ai_board = board_cls(board_size)
         self.board_size = board_size
         self.turn_count = 0
         self.game_over = False
         self.winner = None
+        self.recorder = recorder
+        self.timer = timer
+        # Ship sunk by the latest shot of each side, if any
+        self.player_sunk: Optional[ShipType] = None
+        self.ai_sunk: Optional[ShipType] = None
 
         # Set AI strategy
         if ai_strategy is None:
@@ -36,6 +65,9 @@ class Game:
         # Reset the AI strategy
         self.ai_strategy.reset()
 
+        if self.recorder is not None:
+            self.recorder.start_game(self.player_board)
+
     def player_shoot(self, position: Tuple[int, int]) -> CellState:
         """
         Process a player's shot.
@@ -44,55 +76,77 @@ class Game:
             position: (row, col) tuple indicating the shot position
 
         Returns:
-            CellState: The result of the shot
+            CellState: The result of the shot; the ship it sank, if any, is
+                left in self.player_sunk
         """
+        self.player_sunk = None
         if self.game_over:
             return CellState.UNKNOWN
 
-        result = self.ai_board.receive_shot(position)
+        result, self.player_sunk = timed(self.timer, "receive_shot", self.ai_board.resolve_shot, position)
 
         # Check if game is over
-        if self.ai_board.are_all_ships_sunk():
-            self.game_over = True
-            self.winner = "Player"
+        if timed(self.timer, "are_all_ships_sunk", self.ai_board.are_all_ships_sunk):
+            self._end_game("Player")
 
         return result
 
-    def ai_shoot(self) -> Tuple[Tuple[int, int], CellState]:
+    def ai_shoot(self, position: Optional[Tuple[int, int]] = None) -> Tuple[Tuple[int, int], CellState]:
         """
         Process an AI shot based on the current strategy.
 
+        Args:
+            position: The strategy's next shot if it was already chosen, e.g.
+                by a batch of strategies evaluated together (default: ask the strategy)
+
         Returns:
-            Tuple[Tuple[int, int], CellState]: The shot position and result
+            Tuple[Tuple[int, int], CellState]: The shot position and result;
+                the ship it sank, if any, is left in self.ai_sunk
         """
+        self.ai_sunk = None
         if self.game_over:
             return ((-1, -1), CellState.UNKNOWN)
 
         # Get next shot position from strategy
-        position = self.ai_strategy.get_next_shot()
+        if position is None:
+            position = timed(self.timer, "get_next_shot", self.ai_strategy.get_next_shot)
 
         if position == (-1, -1):
             return ((-1, -1), CellState.UNKNOWN)  # No available positions
 
         # Process the shot
-        result = self.player_board.receive_shot(position)
+        result, sunk = timed(self.timer, "receive_shot", self.player_board.resolve_shot, position)
+        self.ai_sunk = sunk
+
+        # Register the result with the strategy, announcing sunk ships
+        timed(self.timer, "register_result", self.ai_strategy.register_result, position, result, sunk)
 
-        # Register the result with the strategy
-        self.ai_strategy.register_result(position, result)
+        if self.recorder is not None:
+            self.recorder.record_shot(position, result)
 
         # Check if game is over
-        if self.player_board.are_all_ships_sunk():
-            self.game_over = True
-            self.winner = "AI"
+        if timed(self.timer, "are_all_ships_sunk", self.player_board.are_all_ships_sunk):
+            self._end_game("AI")
 
         return (position, result)
 
-    def play_turn(self, player_shot_position: Tuple[int, int]) -> Dict:
+    def _end_game(self, winner: str):
+        """End the game and close its recording."""
+        self.game_over = True
+        self.winner = winner
+
+        if self.recorder is not None:
+            self.recorder.end_game()
+
+    def play_turn(self, player_shot_position: Tuple[int, int],
+                  ai_shot_position: Optional[Tuple[int, int]] = None) -> Dict:
         """
         Play a single turn of the game.
 
         Args:
             player_shot_position: The position the player wants to shoot
+            ai_shot_position: The AI strategy's next shot if it was already
+                chosen (default: ask the strategy)
 
         Returns:
             Dict: Information about the turn results
@@ -113,23 +167,117 @@ class Game:
             return {
                 "player_shot": player_shot_position,
                 "player_result": player_result,
+                "player_sunk": self.player_sunk,
                 "game_over": True,
                 "winner": self.winner
             }
 
         # AI's turn
-        ai_position, ai_result = self.ai_shoot()
+        ai_position, ai_result = self.ai_shoot(ai_shot_position)
 
         return {
             "player_shot": player_shot_position,
             "player_result": player_result,
+            "player_sunk": self.player_sunk,
             "ai_shot": ai_position,
             "ai_result": ai_result,
+            "ai_sunk": self.ai_sunk,
             "game_over": self.game_over,
             "winner": self.winner,
             "turn_count": self.turn_count
         }
 
+    def to_bytes(self, derived: bool = True) -> bytes:
+        """
+        Serialize the game: both boards, the AI strategy and the turn state.
+
+        The AI strategy is stored under its registry name, so its class must
+        be registered. The recorder and timer are not stored.
+
+        Args:
+            derived: Whether to include the strategy's derived state, which
+                makes from_bytes faster at the cost of a larger snapshot
+
+        Returns:
+            bytes: The snapshot, restored by from_bytes
+
+        Raises:
+            KeyError: If the AI strategy's class is not registered
+        """
+        name = strategy_name(type(self.ai_strategy)).encode()
+        flags = int(self.game_over) | WINNERS.index(self.winner) << 1
+        player_sunk = self.player_sunk.value if self.player_sunk is not None else 0
+        ai_sunk = self.ai_sunk.value if self.ai_sunk is not None else 0
+        parts = (self.player_board.to_bytes(), self.ai_board.to_bytes(), self.ai_strategy.to_bytes(derived))
+
+        return b"".join((GAME_HEADER.pack(GAME_VERSION, flags, self.turn_count, player_sunk, ai_sunk, len(name)),
+                         name, GAME_PARTS.pack(*map(len, parts))) + parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, board_cls: Type[Board] = Board,
+                   rng: Optional[random.Random] = None) -> "Game":
+        """
+        Restore a game serialized with to_bytes.
+
+        Snapshots may come from other processes, so the AI strategy is only
+        looked up among the registered strategies and any malformed content
+        raises ValueError.
+
+        Args:
+            data: The snapshot
+            board_cls: Board implementation to restore the boards as (default: Board)
+            rng: Random number generator of the AI strategy (default: the global random module)
+
+        Returns:
+            Game: A game in the same state
+
+        Raises:
+            ValueError: If the data is not a valid snapshot of a supported version
+        """
+        if len(data) < GAME_HEADER.size:
+            raise ValueError("Truncated game snapshot")
+        version, flags, turn_count, player_sunk, ai_sunk, name_length = GAME_HEADER.unpack_from(data)
+        if version != GAME_VERSION:
+            raise ValueError(f"Unsupported game snapshot version {version}")
+        offset = GAME_HEADER.size + name_length
+        if len(data) < offset + GAME_PARTS.size:
+            raise ValueError("Truncated game snapshot")
+        if (flags >> 1) & 3 >= len(WINNERS):
+            raise ValueError("Game snapshot has an invalid winner")
+
+        try:
+            strategy_cls = get_strategy(bytes(data[GAME_HEADER.size:offset]).decode())
+        except (KeyError, UnicodeDecodeError) as error:
+            raise ValueError(f"Game snapshot names an unknown strategy: {error}") from error
+        if not (isinstance(strategy_cls, type) and issubclass(strategy_cls, Strategy)):
+            raise ValueError("Game snapshot names something other than a Strategy")
+
+        lengths = GAME_PARTS.unpack_from(data, offset)
+        offset += GAME_PARTS.size
+        if len(data) != offset + sum(lengths):
+            raise ValueError("Game snapshot has the wrong length")
+        parts = []
+        for length in lengths:
+            parts.append(data[offset:offset + length])
+            offset += length
+
+        player_board = board_cls.from_bytes(parts[0])
+        ai_board = board_cls.from_bytes(parts[1])
+        if player_board.size != ai_board.size:
+            raise ValueError("Game snapshot mixes board sizes")
+        # The board sizes are bounded by the length of their data, the strategy's is not
+        strategy = strategy_cls.from_bytes(parts[2], rng, player_board.size)
+
+        game = cls(player_board.size, strategy, board_cls)
+        game.player_board = player_board
+        game.ai_board = ai_board
+        game.turn_count = turn_count
+        game.game_over = bool(flags & 1)
+        game.winner = WINNERS[(flags >> 1) & 3]
+        game.player_sunk = ShipType(player_sunk) if player_sunk else None
+        game.ai_sunk = ShipType(ai_sunk) if ai_sunk else None
+        return game
+
     def display_boards(self):
         """Display both game boards."""
         print("\nPlayer's Board:")
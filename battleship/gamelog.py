@@ -0,0 +1,299 @@
+import struct
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional, Tuple, Type
+
+from battleship.core import SHIP_RECORD, Board, CellState, Orientation, Ship, ShipType
+
+# File layout (little endian):
+#   header: magic (8s), version (u16)
+#   frames: one per game, appended as games finish
+#     length (u32) of the rest of the frame
+#     board size (u16), number of ships (u8)
+#     per ship: size (u8), orientation (u8), start cell (u16)
+#     shots:  one unit per shot, cell index | HIT flag, and after a hit that
+#             sinks a ship an extra unit holding cells + size of that ship
+#
+# Units are one byte when every code fits in 7 bits plus the HIT flag, which
+# holds boards up to 10x10, and two bytes otherwise.
+MAGIC = b"BSGAMLOG"
+VERSION = 1
+HEADER = struct.Struct("<8sH")
+FRAME_LENGTH = struct.Struct("<I")
+FRAME_HEADER = struct.Struct("<HB")
+
+
+def unit_width(board_size: int) -> int:
+    """
+    Get the number of bytes per shot unit on a board.
+
+    Args:
+        board_size: Size of the board
+
+    Returns:
+        int: 1 or 2
+    """
+    return 1 if board_size * board_size + board_size < 0x80 else 2
+
+
+def hit_flag(width: int) -> int:
+    """Flag bit marking a hit in a shot unit of the given width."""
+    return 0x80 if width == 1 else 0x8000
+
+
+def encode_shots(board_size: int,
+                 shots: Iterable[Tuple[Tuple[int, int], CellState, Optional[ShipType]]]) -> bytes:
+    """
+    Encode shots as game log units.
+
+    Args:
+        board_size: Size of the board shot at
+        shots: The position and result of each shot, and the ship it sank if any
+
+    Returns:
+        bytes: The units, in the format GameRecord.shots decodes
+    """
+    width = unit_width(board_size)
+    flag = hit_flag(width)
+    cells = board_size * board_size
+
+    units = []
+    for (row, col), result, sunk in shots:
+        cell = row * board_size + col
+        units.append(cell | flag if result == CellState.HIT else cell)
+        if sunk is not None:
+            units.append(cells + sunk.value)
+    return struct.pack(f"<{len(units)}{'B' if width == 1 else 'H'}", *units)
+
+
+@dataclass
+class GameRecord:
+    """The fleet layout and shots of one recorded game."""
+    board_size: int
+    ships: List[Tuple[ShipType, Orientation, Tuple[int, int]]]
+    data: bytes
+
+    def board(self, board_cls: Type[Board] = Board) -> Board:
+        """
+        Build the board of the game before the first shot.
+
+        Args:
+            board_cls: Board implementation to build
+
+        Returns:
+            Board: A board with the recorded ships placed and no shots taken
+        """
+        board = board_cls(self.board_size)
+        for ship_type, orientation, start in self.ships:
+            board.place_ship(Ship(ship_type, orientation, start))
+        return board
+
+    def shots(self) -> Iterator[Tuple[Tuple[int, int], CellState, Optional[ShipType]]]:
+        """
+        Decode the shots of the game.
+
+        Yields:
+            Tuple[Tuple[int, int], CellState, Optional[ShipType]]: The position
+                and result of each shot, and the ship it sank if any
+        """
+        cells = self.board_size * self.board_size
+        flag = hit_flag(unit_width(self.board_size))
+
+        pending = None
+        for unit in self._units():
+            if unit < flag and unit >= cells:
+                # Sunk marker for the hit just before it
+                yield pending[0], pending[1], ShipType(unit - cells)
+                pending = None
+                continue
+            if pending is not None:
+                yield pending[0], pending[1], None
+            cell = unit & (flag - 1)
+            pending = (divmod(cell, self.board_size), CellState.HIT if unit & flag else CellState.MISS)
+
+        if pending is not None:
+            yield pending[0], pending[1], None
+
+    @property
+    def num_shots(self) -> int:
+        """Number of shots taken in the game."""
+        cells = self.board_size * self.board_size
+        flag = hit_flag(unit_width(self.board_size))
+        return sum(1 for unit in self._units() if unit >= flag or unit < cells)
+
+    def _units(self):
+        """The shot units of the game as integers."""
+        if unit_width(self.board_size) == 1:
+            return self.data
+        return struct.unpack(f"<{len(self.data) // 2}H", self.data)
+
+
+class GameRecorder:
+    """
+    Streams the shots of games into an append-only binary log.
+
+    Call start_game with the board being shot at, record_shot after every
+    shot, and end_game once it is over. Finished games are buffered in memory
+    and written in large blocks, so recording costs little more than
+    appending a byte per shot. Sunk ships are worked out from the recorded
+    layout, so callers only pass the position and result of each shot.
+    """
+
+    def __init__(self, path: str, buffer_size: int = 1 << 20):
+        """
+        Open a log for appending, creating it if needed.
+
+        Args:
+            path: Path of the log file
+            buffer_size: Bytes of finished games kept in memory between writes
+        """
+        self.path = path
+        self.buffer_size = buffer_size
+        self.buffer = bytearray()
+        self.games = 0
+
+        self.file = open(path, "ab")
+        if self.file.tell() == 0:
+            self.file.write(HEADER.pack(MAGIC, VERSION))
+
+        self.board_size = 0
+        self.width = 1
+        self.hit_flag = hit_flag(1)
+        self.layout = b""
+        self.shot_units = bytearray()
+
+    def start_game(self, board: Board):
+        """
+        Start recording a game.
+
+        Args:
+            board: The board being shot at, with its ships placed
+        """
+        size = board.size
+        self.board_size = size
+        self.width = unit_width(size)
+        self.hit_flag = hit_flag(self.width)
+        self.shot_units = bytearray()
+
+        layout = [FRAME_HEADER.pack(size, len(board.ships))]
+        self.cell_ship = [-1] * (size * size)
+        self.remaining = []
+        self.sizes = []
+        for index, ship in enumerate(board.ships):
+            row, col = ship.start_position
+            layout.append(SHIP_RECORD.pack(ship.size, ship.orientation.value, row * size + col))
+            for ship_row, ship_col in ship.positions:
+                self.cell_ship[ship_row * size + ship_col] = index
+            self.remaining.append(ship.size)
+            self.sizes.append(ship.size)
+        self.layout = b"".join(layout)
+        self.seen = bytearray(size * size)
+
+    def record_shot(self, position: Tuple[int, int], result: CellState):
+        """
+        Record one shot of the current game.
+
+        Args:
+            position: (row, col) position that was shot
+            result: Result of the shot
+
+        Raises:
+            ValueError: If the position is off the board
+        """
+        row, col = position
+        size = self.board_size
+        if not (0 <= row < size and 0 <= col < size):
+            raise ValueError(f"Cannot record shot at {position} on a {size}x{size} board")
+        cell = row * size + col
+
+        if result == CellState.HIT:
+            self._append(cell | self.hit_flag)
+            index = self.cell_ship[cell]
+            if not self.seen[cell] and index >= 0:
+                self.remaining[index] -= 1
+                if not self.remaining[index]:
+                    self._append(size * size + self.sizes[index])
+        else:
+            self._append(cell)
+        self.seen[cell] = 1
+
+    def _append(self, unit: int):
+        """Append one unit to the shots of the current game."""
+        if self.width == 1:
+            self.shot_units.append(unit)
+        else:
+            self.shot_units += unit.to_bytes(2, "little")
+
+    def end_game(self):
+        """Finish the current game and queue its frame for writing."""
+        frame_length = len(self.layout) + len(self.shot_units)
+        self.buffer += FRAME_LENGTH.pack(frame_length)
+        self.buffer += self.layout
+        self.buffer += self.shot_units
+        self.games += 1
+        self.shot_units = bytearray()
+
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered games to the log."""
+        if self.buffer:
+            self.file.write(self.buffer)
+            self.buffer = bytearray()
+        self.file.flush()
+
+    def close(self):
+        """Write the buffered games and close the log."""
+        self.flush()
+        self.file.close()
+
+    def __enter__(self) -> "GameRecorder":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def read_games(path: str, buffer_size: int = 1 << 20) -> Iterator[GameRecord]:
+    """
+    Stream the games of a log.
+
+    Args:
+        path: Path of the log file
+        buffer_size: Read buffer size in bytes
+
+    Yields:
+        GameRecord: Each recorded game, in the order they finished
+
+    Raises:
+        ValueError: If the file is not a game log of a supported version, or
+            ends in the middle of a game
+    """
+    with open(path, "rb", buffering=buffer_size) as file:
+        header = file.read(HEADER.size)
+        if len(header) < HEADER.size or HEADER.unpack(header)[0] != MAGIC:
+            raise ValueError(f"{path} is not a battleship game log")
+        version = HEADER.unpack(header)[1]
+        if version != VERSION:
+            raise ValueError(f"Unsupported game log version {version} in {path}")
+
+        while True:
+            prefix = file.read(FRAME_LENGTH.size)
+            if not prefix:
+                return
+            if len(prefix) < FRAME_LENGTH.size:
+                raise ValueError(f"Truncated game in {path}")
+            frame_length, = FRAME_LENGTH.unpack(prefix)
+            frame = file.read(frame_length)
+            if len(frame) < frame_length:
+                raise ValueError(f"Truncated game in {path}")
+
+            board_size, num_ships = FRAME_HEADER.unpack_from(frame)
+            ships = []
+            offset = FRAME_HEADER.size
+            for _ in range(num_ships):
+                ship_size, orientation, start = SHIP_RECORD.unpack_from(frame, offset)
+                ships.append((ShipType(ship_size), Orientation(orientation), divmod(start, board_size)))
+                offset += SHIP_RECORD.size
+
+            yield GameRecord(board_size, ships, frame[offset:])
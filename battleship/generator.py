@@ -0,0 +1,165 @@
+from typing import Optional, Sequence, Union
+
+import numpy as np
+
+from battleship.core import Board, ShipType, STANDARD_FLEET
+from battleship.placements import PLACEMENT_MODES, get_placement_table
+
+
+class PlacementGenerator:
+    """
+    Generates random fleet layouts in bulk with NumPy.
+
+    In "sequential" mode layouts follow the default Board.random_placement
+    distribution: each ship is uniform over the placements left free by the
+    ships before it. Every board of a batch draws a placement for the current
+    ship at once, boards whose draw overlaps an earlier ship draw again, and
+    the rare boards where a ship has no room left start over, so generation
+    never fails. Overlap tests run on one flat array per 64-bit word of the
+    bitmasks, and large requests are drawn in chunks that stay in cache.
+
+    In "uniform" mode every complete layout is equally likely: all ships are
+    drawn independently, the pairwise compatibility table of the placements
+    rejects layouts with overlaps, and rejected boards are drawn again.
+    """
+
+    # Draws of one ship before a board is considered a dead end and restarted
+    MAX_TRIES = 64
+    # Boards drawn per batch; larger batches fall out of cache and slow down
+    CHUNK = 1 << 16
+
+    def __init__(self, board_size: int = 10, fleet: Sequence[ShipType] = STANDARD_FLEET,
+                 seed: Union[None, int, np.random.Generator] = None, mode: str = "sequential"):
+        """
+        Initialize the generator.
+
+        Args:
+            board_size: Size of the board (default: 10x10)
+            fleet: Ships to place (default: the standard fleet)
+            seed: Seed or NumPy random generator (default: freshly seeded)
+            mode: One of PLACEMENT_MODES (default: "sequential")
+
+        Raises:
+            ValueError: If the mode is unknown or the fleet cannot fit on the board
+        """
+        if mode not in PLACEMENT_MODES:
+            raise ValueError(f"Unknown placement mode '{mode}', expected one of {', '.join(PLACEMENT_MODES)}")
+        self.mode = mode
+        self.board_size = board_size
+        self.fleet = tuple(fleet)
+        self.table = get_placement_table(board_size, self.fleet)
+        self.rng = np.random.default_rng(seed)
+
+        if not self.table.fits:
+            raise ValueError(f"Fleet does not fit on a {board_size}x{board_size} board")
+
+        # Placement bitmasks split into one array per 64-bit word for vectorized overlap tests
+        self.words = [
+            np.array([(mask >> (64 * word)) & 0xFFFFFFFFFFFFFFFF for mask in self.table.bitmasks], dtype=np.uint64)
+            for word in range((self.table.num_cells + 63) // 64)
+        ]
+
+    def fleets(self, count: int) -> np.ndarray:
+        """
+        Generate random fleet layouts.
+
+        Args:
+            count: Number of layouts
+
+        Returns:
+            np.ndarray: (count, len(fleet)) placement index of each ship
+        """
+        placements = np.empty((count, len(self.fleet)), dtype=np.intp)
+        pending = np.arange(count)
+
+        draw = self._draw_uniform if self.mode == "uniform" else self._draw
+        while pending.size:
+            batch, rest = pending[:self.CHUNK], pending[self.CHUNK:]
+            drawn, ok = draw(batch.size)
+            placements[batch[ok]] = drawn[ok]
+            pending = np.concatenate([batch[~ok], rest])
+
+        return placements
+
+    def _draw(self, count: int):
+        """Draw one layout per board, flagging the boards that dead ended."""
+        occupied = [np.zeros(count, dtype=np.uint64) for _ in self.words]
+        chosen = np.empty((count, len(self.fleet)), dtype=np.intp)
+        ok = np.ones(count, dtype=bool)
+
+        for slot in range(len(self.fleet)):
+            placements = self.table.ship_placements[slot]
+            todo = np.arange(count)
+            for _ in range(self.MAX_TRIES):
+                picks = self.rng.integers(placements.start, placements.stop, size=todo.size)
+                clash = np.zeros(todo.size, dtype=bool)
+                for taken, word in zip(occupied, self.words):
+                    clash |= (taken[todo] & word[picks]) != 0
+                placed, picks = todo[~clash], picks[~clash]
+                chosen[placed, slot] = picks
+                for taken, word in zip(occupied, self.words):
+                    taken[placed] |= word[picks]
+                todo = todo[clash]
+                if not todo.size:
+                    break
+            ok[todo] = False
+
+        return chosen, ok
+
+    def _draw_uniform(self, count: int):
+        """Draw every ship independently, flagging the boards with overlaps."""
+        chosen = np.stack([
+            self.rng.integers(placements.start, placements.stop, size=count)
+            for placements in self.table.ship_placements
+        ], axis=1)
+
+        compatible = self.table.compatible
+        ok = np.ones(count, dtype=bool)
+        for first in range(len(self.fleet)):
+            for second in range(first + 1, len(self.fleet)):
+                ok &= compatible[chosen[:, first], chosen[:, second]]
+
+        return chosen, ok
+
+    def to_grids(self, placements: np.ndarray) -> np.ndarray:
+        """
+        Paint fleet layouts onto boards.
+
+        Args:
+            placements: (N, len(fleet)) placement index of each ship
+
+        Returns:
+            np.ndarray: (N, size, size) int8 array of the fleet slot of the ship
+                in each cell, -1 for water
+        """
+        return self.table.to_grids(placements)
+
+    def boards(self, count: int) -> np.ndarray:
+        """
+        Generate random boards.
+
+        Args:
+            count: Number of boards
+
+        Returns:
+            np.ndarray: (count, size, size) int8 array of ship indices, -1 for water
+        """
+        return self.to_grids(self.fleets(count))
+
+    def to_board(self, placements: Sequence[int], board: Optional[Board] = None) -> Board:
+        """
+        Build a Board holding one fleet layout.
+
+        Args:
+            placements: Placement index of each ship
+            board: Board to place the ships on (default: a new Board)
+
+        Returns:
+            Board: The board with its ships placed
+        """
+        if board is None:
+            board = Board(self.board_size)
+        board.clear_ships()
+        for placement in placements:
+            board.place_ship(self.table.to_ship(int(placement)))
+        return board
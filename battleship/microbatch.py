@@ -0,0 +1,159 @@
+import asyncio
+from concurrent.futures import Executor
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Type
+
+import numpy as np
+
+from battleship.strategy import ProbabilityStrategy, Strategy
+
+# Functions choosing the next shot of many strategies of one class at once
+MoveBatchFunction = Callable[[Sequence[Strategy]], List[Tuple[int, int]]]
+
+# Vectorized move functions keyed by the exact Strategy class they serve
+_MOVE_BATCHERS: Dict[Type[Strategy], MoveBatchFunction] = {}
+
+
+def register_move_batcher(strategy_cls: Type[Strategy]) -> Callable[[MoveBatchFunction], MoveBatchFunction]:
+    """
+    Decorator registering a function choosing the next shot of many strategies at once.
+
+    The function must return exactly what calling get_next_shot on each
+    strategy would. It is only used for instances of exactly strategy_cls,
+    since subclasses may choose their shots differently.
+
+    Args:
+        strategy_cls: The Strategy class the function serves
+
+    Returns:
+        The decorator
+    """
+    def decorator(function: MoveBatchFunction) -> MoveBatchFunction:
+        _MOVE_BATCHERS[strategy_cls] = function
+        return function
+    return decorator
+
+
+def next_shots(strategies: Sequence[Strategy]) -> List[Tuple[int, int]]:
+    """
+    Choose the next shot of many strategies, vectorized where possible.
+
+    Strategies are grouped by class; classes with a registered move batcher
+    are evaluated together and all others one by one.
+
+    Args:
+        strategies: The strategies to move
+
+    Returns:
+        List[Tuple[int, int]]: The next shot of each strategy, in order
+    """
+    shots: List[Tuple[int, int]] = [(-1, -1)] * len(strategies)
+    groups: Dict[Type[Strategy], List[int]] = {}
+    for index, strategy in enumerate(strategies):
+        groups.setdefault(type(strategy), []).append(index)
+
+    for strategy_cls, indices in groups.items():
+        batcher = _MOVE_BATCHERS.get(strategy_cls)
+        if batcher is None or len(indices) == 1:
+            for index in indices:
+                shots[index] = strategies[index].get_next_shot()
+        else:
+            for index, shot in zip(indices, batcher([strategies[index] for index in indices])):
+                shots[index] = shot
+    return shots
+
+
+@register_move_batcher(ProbabilityStrategy)
+def probability_next_shots(strategies: Sequence[ProbabilityStrategy]) -> List[Tuple[int, int]]:
+    """Vectorized ProbabilityStrategy.get_next_shot: argmax of the stacked densities over open cells."""
+    board_size = strategies[0].board_size
+    if any(strategy.board_size != board_size for strategy in strategies):
+        return [strategy.get_next_shot() for strategy in strategies]
+
+    density = np.array([strategy.density for strategy in strategies], dtype=np.int64)
+    open_cells = np.array([strategy.open_cells for strategy in strategies], dtype=bool)
+    density[~open_cells] = -1
+
+    # argmax takes the first maximum, matching the scalar tie break
+    best = density.argmax(axis=1)
+    return [divmod(int(cell), board_size) if has_open else (-1, -1)
+            for cell, has_open in zip(best, open_cells.any(axis=1))]
+
+
+class MoveBatcher:
+    """
+    Collects AI move requests from concurrent sessions and answers them in batches.
+
+    The first request of a batch opens a window of `window` seconds; every
+    request arriving meanwhile joins the batch, which is evaluated with
+    next_shots on the executor once the window closes or max_batch requests
+    are waiting. Batching amortizes the executor hand-off and lets NumPy
+    evaluate many strategies at once, while the window bounds the latency it
+    adds to any single move.
+    """
+
+    def __init__(self, window: float = 0.001, max_batch: int = 256, executor: Optional[Executor] = None):
+        """
+        Initialize the batcher.
+
+        Args:
+            window: Seconds a batch waits for more requests after its first one
+            max_batch: Requests that close a batch early
+            executor: Executor evaluating batches (default: the event loop's default executor)
+        """
+        self.window = window
+        self.max_batch = max_batch
+        self.executor = executor
+        self.pending: List[Tuple[Strategy, asyncio.Future]] = []
+        self.timer: Optional[asyncio.TimerHandle] = None
+        self.batches = 0
+        self.moves = 0
+
+    async def next_shot(self, strategy: Strategy) -> Tuple[int, int]:
+        """
+        Get a strategy's next shot as part of the next batch.
+
+        A strategy must not be submitted again before its previous shot is
+        answered.
+
+        Args:
+            strategy: The strategy to move
+
+        Returns:
+            Tuple[int, int]: What strategy.get_next_shot() returns
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.pending.append((strategy, future))
+
+        if len(self.pending) >= self.max_batch:
+            self._flush()
+        elif self.timer is None:
+            self.timer = loop.call_later(self.window, self._flush)
+
+        return await future
+
+    def _flush(self):
+        """Send the waiting requests off as one batch."""
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        batch, self.pending = self.pending, []
+        if batch:
+            asyncio.get_running_loop().create_task(self._evaluate(batch))
+
+    async def _evaluate(self, batch: List[Tuple[Strategy, asyncio.Future]]):
+        """Evaluate a batch on the executor and answer its requests."""
+        strategies = [strategy for strategy, _ in batch]
+        try:
+            shots = await asyncio.get_running_loop().run_in_executor(self.executor, next_shots, strategies)
+        except Exception as error:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+
+        self.batches += 1
+        self.moves += len(batch)
+        for (_, future), shot in zip(batch, shots):
+            if not future.done():
+                future.set_result(shot)
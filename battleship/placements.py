@@ -0,0 +1,365 @@
+import random
+from functools import cached_property, lru_cache
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from battleship.core import Orientation, Ship, ShipType, STANDARD_FLEET
+
+# How fleets are laid out at random:
+#   "sequential": each ship uniform over the placements left free by the ships
+#                 before it (fast, but favors some layouts over others)
+#   "uniform":    every complete fleet layout equally likely
+PLACEMENT_MODES = ("sequential", "uniform")
+
+# An announced sunk ship: position of the shot that sank it, its type, and the
+# bitmask of the hits known when it sank, which holds every cell of the ship
+SunkShip = Tuple[Tuple[int, int], ShipType, int]
+
+
+class PlacementTable:
+    """
+    Every legal placement of every ship of a fleet on an empty board.
+
+    Cells are indexed as ``row * board_size + col``. Placements of the same
+    fleet slot are contiguous, so ``ship_placements[slot]`` is a range of
+    placement indices. Tables are immutable and shared through
+    get_placement_table, so never modify one in place.
+    """
+
+    def __init__(self, board_size: int, fleet: Tuple[ShipType, ...]):
+        """
+        Build the table.
+
+        Args:
+            board_size: Size of the board
+            fleet: Ships of the fleet, one entry per ship
+        """
+        self.board_size = board_size
+        self.fleet = fleet
+        self.num_cells = board_size * board_size
+
+        self.ship_index: List[int] = []
+        self.orientations: List[Orientation] = []
+        self.starts: List[int] = []
+        self.cells: List[Tuple[int, ...]] = []
+        self.bitmasks: List[int] = []
+        self.ship_placements: List[range] = []
+
+        for slot, ship_type in enumerate(fleet):
+            first = len(self.cells)
+            size = ship_type.value
+            for row in range(board_size):
+                for col in range(board_size):
+                    start = row * board_size + col
+                    if col + size <= board_size:
+                        self._add(slot, Orientation.HORIZONTAL, start, tuple(start + i for i in range(size)))
+                    if row + size <= board_size:
+                        self._add(slot, Orientation.VERTICAL, start, tuple(start + i * board_size for i in range(size)))
+            self.ship_placements.append(range(first, len(self.cells)))
+
+        # Inverted index: placements covering each cell
+        cell_placements: List[List[int]] = [[] for _ in range(self.num_cells)]
+        for placement, cells in enumerate(self.cells):
+            for cell in cells:
+                cell_placements[cell].append(placement)
+        self.cell_placements: List[Tuple[int, ...]] = [tuple(placements) for placements in cell_placements]
+
+        # Number of placements covering each cell on an empty board
+        self.coverage: List[int] = [len(placements) for placements in self.cell_placements]
+
+    def _add(self, slot: int, orientation: Orientation, start: int, cells: Tuple[int, ...]):
+        """Append a placement of the ship in the given fleet slot."""
+        self.ship_index.append(slot)
+        self.orientations.append(orientation)
+        self.starts.append(start)
+        self.cells.append(cells)
+
+        mask = 0
+        for cell in cells:
+            mask |= 1 << cell
+        self.bitmasks.append(mask)
+
+    def __len__(self) -> int:
+        """Number of placements in the table."""
+        return len(self.cells)
+
+    def __deepcopy__(self, memo) -> "PlacementTable":
+        """Tables are immutable, so copies of the strategies using one share it."""
+        return self
+
+    def to_ship(self, placement: int) -> Ship:
+        """
+        Create the Ship described by a placement.
+
+        Args:
+            placement: Index of the placement
+
+        Returns:
+            Ship: A new, undamaged ship
+        """
+        return Ship(self.fleet[self.ship_index[placement]],
+                    self.orientations[placement],
+                    divmod(self.starts[placement], self.board_size))
+
+    def random_fleet(self, rng: Optional[random.Random] = None) -> Optional[List[int]]:
+        """
+        Draw a random non-overlapping placement for every ship of the fleet.
+
+        Each ship is placed uniformly among the placements left free by the
+        ships before it. If a ship has no room left, the previous choices are
+        revisited, so this only fails when the fleet cannot fit at all.
+
+        Args:
+            rng: Random number generator to draw from (default: the global random module)
+
+        Returns:
+            Optional[List[int]]: Placement index of each ship, or None if the fleet doesn't fit
+        """
+        return self._place_from(0, 0, rng if rng is not None else random)
+
+    def uniform_fleet(self, rng: Optional[random.Random] = None) -> Optional[List[int]]:
+        """
+        Draw a fleet layout uniformly among all non-overlapping layouts.
+
+        Every ship is drawn uniformly from all of its placements and the draw
+        starts over as soon as a ship overlaps an earlier one. Every complete
+        layout is produced with the same probability, unlike random_fleet,
+        where the first ships constrain the later ones.
+
+        Args:
+            rng: Random number generator to draw from (default: the global random module)
+
+        Returns:
+            Optional[List[int]]: Placement index of each ship, or None if the fleet doesn't fit
+        """
+        if not self.fits:
+            return None
+        if rng is None:
+            rng = random
+
+        bitmasks = self.bitmasks
+        slots = self.ship_placements
+        while True:
+            occupied = 0
+            fleet = []
+            for placements in slots:
+                placement = placements[rng.randrange(len(placements))]
+                if bitmasks[placement] & occupied:
+                    break
+                occupied |= bitmasks[placement]
+                fleet.append(placement)
+            else:
+                return fleet
+
+    def random_layout(self, rng: Optional[random.Random] = None, mode: str = "sequential") -> Optional[List[int]]:
+        """
+        Draw a fleet layout with the given placement mode.
+
+        Args:
+            rng: Random number generator to draw from (default: the global random module)
+            mode: One of PLACEMENT_MODES (default: "sequential")
+
+        Returns:
+            Optional[List[int]]: Placement index of each ship, or None if the fleet doesn't fit
+
+        Raises:
+            ValueError: If the mode is unknown
+        """
+        if mode == "sequential":
+            return self.random_fleet(rng)
+        if mode == "uniform":
+            return self.uniform_fleet(rng)
+        raise ValueError(f"Unknown placement mode '{mode}', expected one of {', '.join(PLACEMENT_MODES)}")
+
+    @cached_property
+    def fits(self) -> bool:
+        """Whether the whole fleet fits on the board at once."""
+        return self.random_fleet(random.Random(0)) is not None
+
+    def _place_from(self, slot: int, occupied: int, rng: random.Random) -> Optional[List[int]]:
+        """Place the ships from the given fleet slot on, around the occupied cells."""
+        if slot == len(self.fleet):
+            return []
+
+        bitmasks = self.bitmasks
+        placements = self.ship_placements[slot]
+
+        # Drawing until a free placement comes up is uniform over the free ones
+        for _ in range(16 if placements else 0):
+            placement = placements[rng.randrange(len(placements))]
+            if not bitmasks[placement] & occupied:
+                rest = self._place_from(slot + 1, occupied | bitmasks[placement], rng)
+                if rest is not None:
+                    return [placement] + rest
+                break
+
+        # Crowded board or dead end: try every free placement in random order
+        free = [placement for placement in placements if not bitmasks[placement] & occupied]
+        rng.shuffle(free)
+        for placement in free:
+            rest = self._place_from(slot + 1, occupied | bitmasks[placement], rng)
+            if rest is not None:
+                return [placement] + rest
+        return None
+
+    def positions_mask(self, positions: Iterable[Tuple[int, int]]) -> int:
+        """
+        Get the cell bitmask of a set of positions.
+
+        Args:
+            positions: (row, col) positions on the board
+
+        Returns:
+            int: Bitmask with the bit of every position set
+        """
+        mask = 0
+        for row, col in positions:
+            mask |= 1 << (row * self.board_size + col)
+        return mask
+
+    def sunk_ships(self, hits: Sequence[Tuple[int, int]],
+                   sunk: Sequence[Tuple[Tuple[int, int], ShipType]]) -> List[SunkShip]:
+        """
+        Pair every announced sunk ship with the hits known when it sank.
+
+        Args:
+            hits: Positions hit so far, in the order they were shot
+            sunk: (position, ship type) of the shot that sank each ship so far
+
+        Returns:
+            List[SunkShip]: Each sunk ship with the bitmask of the hits up to
+                and including the shot that sank it
+        """
+        sinking = dict(sunk)
+        hit_masks = {}
+        mask = 0
+        for row, col in hits:
+            mask |= 1 << (row * self.board_size + col)
+            if (row, col) in sinking:
+                hit_masks.setdefault((row, col), mask)
+        return [(position, ship_type, hit_masks.get(position, mask)) for position, ship_type in sunk]
+
+    def consistent_placements(self, hit_mask: int, miss_mask: int,
+                              sunk: Optional[Sequence[SunkShip]] = None) -> List[List[int]]:
+        """
+        Get the placements each fleet slot can still take given the shots so far.
+
+        Args:
+            hit_mask: Bitmask of known hits
+            miss_mask: Bitmask of known misses
+            sunk: Ships sunk so far, as built by sunk_ships, or None if sunk
+                ships are not announced
+
+        Returns:
+            List[List[int]]: Placement indices allowed for each fleet slot
+        """
+        bitmasks = self.bitmasks
+        candidates = [
+            [p for p in self.ship_placements[slot] if not bitmasks[p] & miss_mask]
+            for slot in range(len(self.fleet))
+        ]
+        if sunk is None:
+            return candidates
+
+        # A sunk ship lies on cells hit by the time it sank and covers the cell that sank it
+        sunk_slots = set()
+        for (row, col), ship_type, sunk_hit_mask in sunk:
+            bit = 1 << (row * self.board_size + col)
+            for slot, fleet_type in enumerate(self.fleet):
+                if fleet_type == ship_type and slot not in sunk_slots:
+                    sunk_slots.add(slot)
+                    candidates[slot] = [
+                        p for p in candidates[slot]
+                        if bitmasks[p] & bit and bitmasks[p] & ~sunk_hit_mask == 0
+                    ]
+                    break
+
+        # Any other ship lying on hits only would have been announced as sunk
+        for slot in range(len(self.fleet)):
+            if slot not in sunk_slots:
+                candidates[slot] = [p for p in candidates[slot] if bitmasks[p] & ~hit_mask]
+
+        return candidates
+
+    @cached_property
+    def masks(self):
+        """(P, num_cells) boolean NumPy array of the cells each placement covers."""
+        # NumPy is only imported by the callers that need the array form
+        import numpy as np
+
+        masks = np.zeros((len(self.cells), self.num_cells), dtype=bool)
+        for placement, cells in enumerate(self.cells):
+            masks[placement, list(cells)] = True
+        masks.flags.writeable = False
+        return masks
+
+    @cached_property
+    def compatible(self):
+        """(P, P) boolean NumPy array telling which pairs of placements don't overlap."""
+        import numpy as np
+
+        masks = self.masks.astype(np.float32)
+        compatible = masks @ masks.T == 0
+        compatible.flags.writeable = False
+        return compatible
+
+    @cached_property
+    def slot_cells(self):
+        """Per fleet slot, a (placements, ship size) NumPy array of the cells of each placement."""
+        import numpy as np
+
+        slot_cells = []
+        for placements in self.ship_placements:
+            cells = np.array([self.cells[p] for p in placements], dtype=np.intp).reshape(len(placements), -1)
+            cells.flags.writeable = False
+            slot_cells.append(cells)
+        return slot_cells
+
+    def to_grids(self, placements):
+        """
+        Paint fleet layouts onto boards.
+
+        Args:
+            placements: (N, len(fleet)) NumPy array of the placement index of each ship
+
+        Returns:
+            np.ndarray: (N, board_size, board_size) int8 array of the fleet slot
+                of the ship in each cell, -1 for water
+        """
+        import numpy as np
+
+        count = len(placements)
+        grids = np.full((count, self.num_cells), -1, dtype=np.int8)
+        rows = np.arange(count)[:, None]
+        for slot, slot_placements in enumerate(self.ship_placements):
+            grids[rows, self.slot_cells[slot][placements[:, slot] - slot_placements.start]] = slot
+        return grids.reshape(count, self.board_size, self.board_size)
+
+    @cached_property
+    def cell_index(self):
+        """Per-cell NumPy arrays of the placements covering that cell."""
+        import numpy as np
+
+        index = []
+        for placements in self.cell_placements:
+            array = np.array(placements, dtype=np.intp)
+            array.flags.writeable = False
+            index.append(array)
+        return index
+
+
+@lru_cache(maxsize=None)
+def get_placement_table(board_size: int = 10, fleet: Tuple[ShipType, ...] = STANDARD_FLEET) -> PlacementTable:
+    """
+    Get the placement table for a board size and fleet.
+
+    Tables are built on first use and memoized, so every strategy instance
+    and every game in a process shares the same one.
+
+    Args:
+        board_size: Size of the board (default: 10x10)
+        fleet: Ships of the fleet (default: the standard fleet)
+
+    Returns:
+        PlacementTable: The shared placement table
+    """
+    return PlacementTable(board_size, tuple(fleet))
@@ -0,0 +1,113 @@
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Phases of a turn reported to timer callbacks
+PHASES = ("get_next_shot", "receive_shot", "register_result", "are_all_ships_sunk")
+
+# Timer callbacks receive the phase name and its duration in nanoseconds
+TimerCallback = Callable[[str, int], None]
+
+
+def timed(timer: Optional[TimerCallback], phase: str, method: Callable, *args):
+    """
+    Call a method, reporting its duration to a timer callback if there is one.
+
+    Args:
+        timer: Callback receiving the phase and its duration, or None
+        phase: Name of the phase being timed
+        method: The method to call
+        *args: Arguments of the call
+
+    Returns:
+        Whatever the method returns
+    """
+    if timer is None:
+        return method(*args)
+    start = time.perf_counter_ns()
+    result = method(*args)
+    timer(phase, time.perf_counter_ns() - start)
+    return result
+
+
+class PhaseTimer:
+    """
+    Timer callback collecting call counts and latency histograms per phase.
+
+    Durations land in power-of-two buckets: bucket b counts calls that took
+    less than 2**b but at least 2**(b - 1) nanoseconds. Recording a call is a
+    couple of additions, so timing a benchmark barely slows it down.
+    """
+
+    def __init__(self):
+        """Initialize an empty timer."""
+        self.counts: Dict[str, int] = {}
+        self.totals: Dict[str, int] = {}
+        self.buckets: Dict[str, List[int]] = {}
+
+    def __call__(self, phase: str, elapsed: int):
+        """
+        Record one call of a phase.
+
+        Args:
+            phase: Name of the phase
+            elapsed: Duration of the call in nanoseconds
+        """
+        buckets = self.buckets.get(phase)
+        if buckets is None:
+            buckets = self.buckets[phase] = [0] * 64
+            self.counts[phase] = 0
+            self.totals[phase] = 0
+        self.counts[phase] += 1
+        self.totals[phase] += elapsed
+        buckets[min(elapsed.bit_length(), 63)] += 1
+
+    def reset(self):
+        """Forget every recorded call."""
+        self.counts.clear()
+        self.totals.clear()
+        self.buckets.clear()
+
+    def histogram(self, phase: str) -> List[Tuple[int, int]]:
+        """
+        Get the latency histogram of a phase.
+
+        Args:
+            phase: Name of the phase
+
+        Returns:
+            List[Tuple[int, int]]: (upper bound in nanoseconds, calls) of every
+                non-empty bucket, fastest first
+        """
+        return [(1 << bucket, count) for bucket, count in enumerate(self.buckets.get(phase, [])) if count]
+
+    def percentile(self, phase: str, p: float) -> int:
+        """
+        Get an upper bound of a latency percentile of a phase.
+
+        Args:
+            phase: Name of the phase
+            p: Percentile between 0 and 100
+
+        Returns:
+            int: Upper bound in nanoseconds of the bucket holding the percentile
+        """
+        target = self.counts.get(phase, 0) * p / 100
+        seen = 0
+        for upper, count in self.histogram(phase):
+            seen += count
+            if seen >= target:
+                return upper
+        return 0
+
+    def summary(self) -> str:
+        """Format the call counts and latencies of every phase as a table."""
+        phases = [phase for phase in PHASES if phase in self.counts]
+        phases += sorted(phase for phase in self.counts if phase not in PHASES)
+
+        lines = [f"{'phase':<20} {'calls':>10} {'total ms':>10} {'mean us':>9} {'p50 us':>9} {'p99 us':>9}"]
+        for phase in phases:
+            count = self.counts[phase]
+            total = self.totals[phase]
+            lines.append(f"{phase:<20} {count:>10} {total / 1e6:>10.1f} {total / count / 1e3:>9.2f} "
+                         f"{self.percentile(phase, 50) / 1e3:>9.2f} {self.percentile(phase, 99) / 1e3:>9.2f}")
+        return "\n".join(lines)
@@ -0,0 +1,114 @@
+from importlib import import_module
+from typing import TYPE_CHECKING, Callable, Dict, List, Type, Union
+
+if TYPE_CHECKING:
+    from battleship.strategy import Strategy
+
+ENTRY_POINT_GROUP = "battleship.strategies"
+
+# Name -> Strategy class, or "module:attribute" path imported on first use.
+# Keep this module free of heavy imports so listing and selecting strategies
+# only pays for the strategy actually used.
+_registry: Dict[str, Union[str, Type["Strategy"]]] = {
+    "random": "battleship.strategy:RandomStrategy",
+    "hunt": "battleship.strategy:HuntTargetStrategy",
+    "probability": "battleship.strategy:ProbabilityStrategy",
+    "solver": "battleship.solver:SolverStrategy",
+    "montecarlo": "battleship.sampling:MonteCarloStrategy",
+}
+_entry_points_loaded = False
+
+
+def _load_entry_points():
+    """Add lazy entries for strategies advertised by installed packages."""
+    global _entry_points_loaded
+    if _entry_points_loaded:
+        return
+    _entry_points_loaded = True
+
+    # importlib.metadata alone costs tens of milliseconds to import
+    from importlib.metadata import entry_points
+
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+        _registry.setdefault(entry_point.name, entry_point.value)
+
+
+def register_strategy(name: str) -> Callable[[Type["Strategy"]], Type["Strategy"]]:
+    """
+    Class decorator registering a Strategy under a name.
+
+    Args:
+        name: Name used to select the strategy
+
+    Returns:
+        The decorator
+    """
+    def decorator(strategy_cls: Type["Strategy"]) -> Type["Strategy"]:
+        _registry[name] = strategy_cls
+        return strategy_cls
+    return decorator
+
+
+def register_lazy_strategy(name: str, path: str):
+    """
+    Register a strategy that is imported on first use.
+
+    Args:
+        name: Name used to select the strategy
+        path: Location of the class as "module:attribute"
+    """
+    _registry[name] = path
+
+
+def get_strategy(name: str) -> Type["Strategy"]:
+    """
+    Get the Strategy class registered under a name, importing it if needed.
+
+    Args:
+        name: Name of the strategy
+
+    Returns:
+        Type[Strategy]: The strategy class
+
+    Raises:
+        KeyError: If no strategy is registered under the name
+    """
+    if name not in _registry:
+        _load_entry_points()
+    if name not in _registry:
+        raise KeyError(f"Unknown strategy '{name}', available: {', '.join(available_strategies())}")
+
+    entry = _registry[name]
+    if isinstance(entry, str):
+        module_name, _, attribute = entry.partition(":")
+        entry = getattr(import_module(module_name), attribute)
+        _registry[name] = entry
+    return entry
+
+
+def strategy_name(strategy_cls: Type["Strategy"]) -> str:
+    """
+    Get the name a Strategy class is registered under, without importing other strategies.
+
+    Args:
+        strategy_cls: The strategy class
+
+    Returns:
+        str: A name get_strategy resolves to the class
+
+    Raises:
+        KeyError: If the class is not registered
+    """
+    path = f"{strategy_cls.__module__}:{strategy_cls.__qualname__}"
+    for _ in range(2):
+        for name, entry in _registry.items():
+            if entry is strategy_cls or entry == path:
+                return name
+        _load_entry_points()
+    raise KeyError(f"Strategy class {path} is not registered")
+
+
+def available_strategies() -> List[str]:
+    """Names of every registered strategy, without importing any of them."""
+    _load_entry_points()
+    return list(_registry)
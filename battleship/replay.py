@@ -0,0 +1,185 @@
+import copy
+import random
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Type
+
+import numpy as np
+
+from battleship.batch import BatchSimulator, make_batch_strategy
+from battleship.benchmark import game_rngs, play_game
+from battleship.core import Board, CellState, Orientation, ShipType
+from battleship.gamelog import GameRecord
+from battleship.strategy import Strategy
+
+
+def _snapshot(state):
+    """Deep copy a board or strategy, sharing the global random module if it uses it."""
+    return copy.deepcopy(state, {id(random): random})
+
+
+class Replay:
+    """
+    Reconstructs the state of a recorded game at any turn.
+
+    The recorded shots are applied to a fresh board and, optionally, fed to a
+    strategy as if it had taken them. A copy of both is kept every
+    snapshot_interval turns, so seeking to a turn copies the closest earlier
+    snapshot and applies fewer than snapshot_interval shots to it, instead of
+    replaying the game from the start.
+    """
+
+    def __init__(self, record: GameRecord, strategy: Optional[Strategy] = None,
+                 board_cls: Type[Board] = Board, snapshot_interval: int = 10):
+        """
+        Initialize the replay.
+
+        Args:
+            record: The recorded game
+            strategy: A reset strategy to follow the game; it is copied, not modified
+            board_cls: Board implementation to rebuild the game on
+            snapshot_interval: Turns between snapshots
+
+        Raises:
+            ValueError: If snapshot_interval is not positive
+        """
+        if snapshot_interval < 1:
+            raise ValueError("snapshot_interval must be positive")
+        self.record = record
+        self.snapshot_interval = snapshot_interval
+        self.shots: List[Tuple[Tuple[int, int], CellState, Optional[ShipType]]] = list(record.shots())
+
+        # snapshots[i] is the state after i * snapshot_interval shots
+        strategy = _snapshot(strategy) if strategy is not None else None
+        self.snapshots: List[Tuple[Board, Optional[Strategy]]] = [(record.board(board_cls), strategy)]
+
+    def __len__(self) -> int:
+        """Number of shots in the game."""
+        return len(self.shots)
+
+    def _apply(self, board: Board, strategy: Optional[Strategy], start: int, stop: int):
+        """Apply the shots [start, stop) to a board and strategy in place."""
+        for position, result, sunk in self.shots[start:stop]:
+            board.receive_shot(position)
+            if strategy is not None:
+                strategy.register_result(position, result, sunk)
+
+    def seek(self, turn: int) -> Tuple[Board, Optional[Strategy]]:
+        """
+        Get the state of the game after a number of shots.
+
+        Args:
+            turn: Number of shots taken, from 0 to len(self)
+
+        Returns:
+            Tuple[Board, Optional[Strategy]]: Copies of the board and strategy
+                after that many shots; changing them does not affect the replay
+
+        Raises:
+            IndexError: If turn is out of range
+        """
+        if not 0 <= turn <= len(self.shots):
+            raise IndexError(f"Turn {turn} out of range for a game of {len(self.shots)} shots")
+
+        # Extend the snapshots up to the requested turn
+        interval = self.snapshot_interval
+        while len(self.snapshots) <= turn // interval:
+            board, strategy = (_snapshot(state) for state in self.snapshots[-1])
+            start = (len(self.snapshots) - 1) * interval
+            self._apply(board, strategy, start, start + interval)
+            self.snapshots.append((board, strategy))
+
+        board, strategy = (_snapshot(state) for state in self.snapshots[turn // interval])
+        self._apply(board, strategy, turn - turn % interval, turn)
+        return board, strategy
+
+    def board_at(self, turn: int) -> Board:
+        """Get a copy of the board after a number of shots."""
+        return self.seek(turn)[0]
+
+    def strategy_at(self, turn: int) -> Optional[Strategy]:
+        """Get a copy of the strategy after a number of shots, or None without one."""
+        return self.seek(turn)[1]
+
+
+def replay_games(records: Iterable[GameRecord], strategy_cls: Type[Strategy], board_cls: Type[Board] = Board,
+                 seed: Optional[int] = None) -> List[int]:
+    """
+    Play a strategy on the fleet layouts of recorded games.
+
+    Args:
+        records: The recorded games
+        strategy_cls: The Strategy class to evaluate
+        board_cls: Board implementation to simulate on
+        seed: Master seed of the strategy's random streams, as in a seeded benchmark
+
+    Returns:
+        List[int]: Turns the strategy needs to win each game
+    """
+    strategies: Dict[int, Strategy] = {}
+    turns = []
+
+    for game_index, record in enumerate(records):
+        strategy = strategies.get(record.board_size)
+        if strategy is None:
+            strategy = strategies[record.board_size] = strategy_cls(record.board_size)
+        if seed is not None:
+            strategy.rng = game_rngs(seed, game_index)[1]
+        strategy.reset()
+
+        turns.append(play_game(record.board(board_cls), strategy))
+
+    return turns
+
+
+def record_grids(records: Sequence[GameRecord]) -> np.ndarray:
+    """
+    Paint the fleet layouts of recorded games onto a stack of boards.
+
+    Args:
+        records: Recorded games, all on boards of the same size
+
+    Returns:
+        np.ndarray: (N, size, size) int8 array of ship indices, -1 for water
+
+    Raises:
+        ValueError: If the games were played on boards of different sizes
+    """
+    sizes = {record.board_size for record in records}
+    if len(sizes) > 1:
+        raise ValueError("Recorded games use different board sizes")
+    size = sizes.pop() if sizes else 0
+
+    grids = np.full((len(records), size * size), -1, dtype=np.int8)
+    for game, record in enumerate(records):
+        for index, (ship_type, orientation, (row, col)) in enumerate(record.ships):
+            step = 1 if orientation == Orientation.HORIZONTAL else size
+            start = row * size + col
+            grids[game, start:start + step * ship_type.value:step] = index
+    return grids.reshape(len(records), size, size)
+
+
+def replay_batch(records: Sequence[GameRecord], strategy_cls: Type[Strategy], batch_size: int = 1000,
+                 rng: Optional[np.random.Generator] = None) -> List[int]:
+    """
+    Play a strategy on the fleet layouts of recorded games with the NumPy batch engine.
+
+    Args:
+        records: Recorded games, all on boards of the same size
+        strategy_cls: The Strategy class to evaluate
+        batch_size: Number of games played simultaneously
+        rng: NumPy random generator (default: a freshly seeded one)
+
+    Returns:
+        List[int]: Turns the strategy needs to win each game
+
+    Raises:
+        ValueError: If the games were played on boards of different sizes
+    """
+    grids = record_grids(records)
+    strategy = make_batch_strategy(strategy_cls, grids.shape[1], rng)
+    turns: List[int] = []
+
+    for start in range(0, len(grids), batch_size):
+        simulator = BatchSimulator(grids[start:start + batch_size])
+        turns.extend(simulator.run(strategy).tolist())
+
+    return turns
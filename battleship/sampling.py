@@ -0,0 +1,268 @@
+import math
+import random
+import struct
+import time
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from battleship.core import ShipType, STANDARD_FLEET
+from battleship.placements import SunkShip, get_placement_table
+from battleship.strategy import Strategy
+
+# Snapshot settings of a MonteCarloStrategy: samples (u32), time budget (f64, NaN for none), batch size (u32)
+MONTE_CARLO_SETTINGS = struct.Struct("<IdI")
+
+
+class FleetSampler:
+    """
+    Draws random fleets consistent with the shots so far, with importance weights.
+
+    Ships are placed one after another, each choosing among the precomputed
+    placements that avoid misses, don't overlap the ships already placed, and
+    still leave enough ship cells to cover every remaining hit. Placements
+    covering hits are proposed more often so targeting positions rarely dead
+    end. Each fleet carries the weight 1 / (probability of proposing it), so
+    weighted averages over the samples estimate the uniform posterior over
+    consistent fleets. Many fleets are drawn at once with NumPy, and fleets
+    that dead end are redrawn instead of retrying placements blindly.
+    """
+
+    # Proposal weight multiplier for each known hit a placement covers
+    HIT_BIAS = 8.0
+
+    def __init__(self, board_size: int = 10, fleet: Sequence[ShipType] = STANDARD_FLEET):
+        """
+        Initialize the sampler.
+
+        Args:
+            board_size: Size of the board (default: 10x10)
+            fleet: Ships the opponent places (default: the standard fleet)
+        """
+        self.board_size = board_size
+        self.fleet = tuple(fleet)
+        self.table = get_placement_table(board_size, self.fleet)
+        self.masks = self.table.masks.astype(np.float32)
+
+    def __deepcopy__(self, memo) -> "FleetSampler":
+        """Samplers hold no per-game state, so copies of strategies share them."""
+        return self
+
+    def sample(self, count: int, hit_mask: int, miss_mask: int,
+               sunk: Optional[Sequence[SunkShip]] = None,
+               rng: Optional[np.random.Generator] = None, max_rounds: int = 10) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Draw consistent fleets.
+
+        Args:
+            count: Number of fleets to draw
+            hit_mask: Bitmask of known hits
+            miss_mask: Bitmask of known misses
+            sunk: Ships sunk so far, as built by PlacementTable.sunk_ships, or
+                None if sunk ships are not announced
+            rng: NumPy random generator (default: a freshly seeded one)
+            max_rounds: Times fleets that dead end are redrawn
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (n, len(fleet)) placement indices of
+                each fleet and their (n,) log importance weights; n < count if
+                some fleets still dead ended after max_rounds
+        """
+        if rng is None:
+            rng = np.random.default_rng()
+
+        candidates = self.table.consistent_placements(hit_mask, miss_mask, sunk)
+        if any(not slot_candidates for slot_candidates in candidates):
+            return np.empty((0, len(self.fleet)), dtype=np.intp), np.empty(0)
+
+        hits = np.zeros(self.table.num_cells, dtype=np.float32)
+        hits[[cell for cell in range(self.table.num_cells) if hit_mask >> cell & 1]] = 1.0
+
+        placements = np.empty((count, len(self.fleet)), dtype=np.intp)
+        log_weights = np.empty(count)
+        done = np.zeros(count, dtype=bool)
+        pending = np.arange(count)
+
+        for _ in range(max_rounds):
+            drawn, drawn_weights, ok = self._draw(len(pending), candidates, hits, rng)
+            filled = pending[ok]
+            placements[filled] = drawn[ok]
+            log_weights[filled] = drawn_weights[ok]
+            done[filled] = True
+            pending = pending[~ok]
+            if not pending.size:
+                break
+
+        return placements[done], log_weights[done]
+
+    def _draw(self, count: int, candidates: List[List[int]], hits: np.ndarray,
+              rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Draw one round of fleets.
+
+        Returns:
+            Placements, log importance weights and a mask of the fleets that
+            covered every hit without dead ending
+        """
+        # Most constrained ships first, so dead ends show up early
+        order = sorted(range(len(candidates)), key=lambda slot: len(candidates[slot]))
+        remaining = [0] * (len(order) + 1)
+        for depth in range(len(order) - 1, -1, -1):
+            remaining[depth] = remaining[depth + 1] + self.fleet[order[depth]].value
+
+        occupied = np.zeros((count, self.table.num_cells), dtype=np.float32)
+        uncovered = np.full(count, hits.sum(), dtype=np.float32)
+        chosen = np.zeros((count, len(candidates)), dtype=np.intp)
+        log_weights = np.zeros(count)
+        ok = np.ones(count, dtype=bool)
+        rows = np.arange(count)
+
+        for depth, slot in enumerate(order):
+            slot_candidates = np.asarray(candidates[slot], dtype=np.intp)
+            masks = self.masks[slot_candidates]
+            hit_cover = masks @ hits
+
+            # Free of the ships already placed, and leaving enough cells for the hits
+            feasible = (occupied @ masks.T == 0) & (uncovered[:, None] - hit_cover <= remaining[depth + 1])
+            weights = np.where(feasible, self.HIT_BIAS ** hit_cover, 0.0)
+            totals = weights.sum(axis=1)
+            ok &= totals > 0
+
+            # Inverse CDF draw of one placement per fleet
+            cumulative = np.cumsum(weights, axis=1)
+            picks = (cumulative <= (rng.random(count) * totals)[:, None]).sum(axis=1)
+            picks = np.minimum(picks, len(slot_candidates) - 1)
+
+            # Dead-ended fleets get a meaningless weight and are dropped by ok
+            with np.errstate(divide="ignore", invalid="ignore"):
+                log_weights += np.log(totals) - np.log(weights[rows, picks])
+
+            chosen[:, slot] = slot_candidates[picks]
+            occupied += masks[picks]
+            uncovered -= hit_cover[picks]
+
+        ok &= uncovered == 0
+        return chosen, log_weights, ok
+
+    def placement_weights(self, placements: np.ndarray, log_weights: np.ndarray) -> np.ndarray:
+        """
+        Get the weighted frequency of every placement in a set of fleets.
+
+        The weights are normalized to sum to the number of fleets, so cell
+        frequencies divided by the number of fleets are hit probabilities.
+
+        Args:
+            placements: (n, len(fleet)) placement indices of each fleet
+            log_weights: (n,) log importance weights of the fleets
+
+        Returns:
+            np.ndarray: (P,) weighted count of fleets using each placement
+        """
+        if not len(log_weights):
+            return np.zeros(len(self.table))
+        weights = np.exp(log_weights - log_weights.max())
+        weights *= len(weights) / weights.sum()
+        return np.bincount(placements.ravel(), weights=np.repeat(weights, placements.shape[1]),
+                           minlength=len(self.table))
+
+
+class MonteCarloStrategy(Strategy):
+    """A strategy that shoots the unshot cell hit most often by sampled consistent fleets."""
+
+    # Largest settings accepted from a snapshot; beyond these a single shot takes gigabytes
+    MAX_SAMPLES = 100000
+    MAX_BATCH_SIZE = 10000
+
+    def __init__(self, board_size: int = 10, rng: Optional[random.Random] = None,
+                 fleet: Sequence[ShipType] = STANDARD_FLEET, samples: int = 1000,
+                 time_budget: Optional[float] = None, batch_size: int = 250):
+        """
+        Initialize the strategy.
+
+        Args:
+            board_size: Size of the board (default: 10x10)
+            rng: Random number generator to draw from (default: the global random module)
+            fleet: Ships the opponent places (default: the standard fleet)
+            samples: Most fleets drawn per shot
+            time_budget: Seconds to spend sampling per shot; at least one batch is always drawn
+            batch_size: Fleets drawn at a time between time checks
+        """
+        super().__init__(board_size, rng)
+        self.sampler = FleetSampler(board_size, fleet)
+        self.samples = samples
+        self.time_budget = time_budget
+        self.batch_size = batch_size
+
+    def _settings_bytes(self) -> bytes:
+        """Serialize samples, time_budget (NaN for None) and batch_size, then the fleet as one byte per ship size."""
+        time_budget = float("nan") if self.time_budget is None else self.time_budget
+        return MONTE_CARLO_SETTINGS.pack(self.samples, time_budget, self.batch_size) + bytes(
+            ship_type.value for ship_type in self.sampler.fleet)
+
+    @classmethod
+    def _from_settings(cls, board_size: int, rng: Optional[random.Random], settings: bytes) -> "Strategy":
+        """Construct a reset strategy with the settings saved by _settings_bytes."""
+        samples, time_budget, batch_size = MONTE_CARLO_SETTINGS.unpack_from(settings)
+        if not 1 <= samples <= cls.MAX_SAMPLES:
+            raise ValueError(f"Snapshot samples {samples} is not between 1 and {cls.MAX_SAMPLES}")
+        if not 1 <= batch_size <= cls.MAX_BATCH_SIZE:
+            raise ValueError(f"Snapshot batch_size {batch_size} is not between 1 and {cls.MAX_BATCH_SIZE}")
+        if not (math.isnan(time_budget) or 0 <= time_budget < math.inf):
+            raise ValueError(f"Snapshot time_budget {time_budget} is not a finite number of seconds")
+        fleet = [ShipType(size) for size in settings[MONTE_CARLO_SETTINGS.size:]]
+        return cls(board_size, rng, fleet, samples, None if math.isnan(time_budget) else time_budget, batch_size)
+
+    def estimate(self) -> np.ndarray:
+        """
+        Estimate the hit probability of every cell from sampled fleets.
+
+        Returns:
+            np.ndarray: (board_size, board_size) array of probabilities
+        """
+        table = self.sampler.table
+        hit_mask = table.positions_mask(self.hits)
+        miss_mask = table.positions_mask(self.misses)
+        # Without an announcement yet, stay agnostic about whether the game makes them
+        sunk = table.sunk_ships(self.hits, self.sunk) if self.sunk else None
+        generator = np.random.default_rng(self.rng.getrandbits(64))
+        deadline = None if self.time_budget is None else time.perf_counter() + self.time_budget
+
+        fleets = []
+        log_weights = []
+        drawn = 0
+        while drawn < self.samples:
+            count = min(self.batch_size, self.samples - drawn)
+            placements, weights = self.sampler.sample(count, hit_mask, miss_mask, sunk, generator)
+            fleets.append(placements)
+            log_weights.append(weights)
+            drawn += count
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+
+        if not fleets:
+            return np.zeros((self.board_size, self.board_size))
+        placements = np.concatenate(fleets)
+        placement_weights = self.sampler.placement_weights(placements, np.concatenate(log_weights))
+        cell_weights = placement_weights @ self.sampler.masks
+        if len(placements):
+            cell_weights /= len(placements)
+        return cell_weights.reshape(self.board_size, self.board_size)
+
+    def get_next_shot(self) -> Tuple[int, int]:
+        """
+        Choose the unshot position most likely to hold a ship.
+
+        Returns:
+            Tuple[int, int]: The (row, col) position to target
+        """
+        if not self.available:
+            # No available positions, return an invalid position
+            return (-1, -1)
+
+        probabilities = self.estimate()
+        for row, col in self.shot_set:
+            if 0 <= row < self.board_size and 0 <= col < self.board_size:
+                probabilities[row, col] = -1.0
+
+        row, col = np.unravel_index(int(np.argmax(probabilities)), probabilities.shape)
+        return (int(row), int(col))
@@ -0,0 +1,315 @@
+import argparse
+import asyncio
+import itertools
+import json
+import weakref
+from concurrent.futures import Executor, ThreadPoolExecutor
+from enum import Enum
+from typing import Any, Dict, Optional
+
+from battleship.core import STANDARD_FLEET
+from battleship.game import Game
+from battleship.microbatch import MoveBatcher
+from battleship.registry import available_strategies, get_strategy
+from battleship.sessions import SessionStore
+
+# Longest request line accepted from a client
+MAX_LINE = 1 << 16
+
+# Smallest board the standard fleet fits on
+MIN_BOARD_SIZE = max(ship_type.value for ship_type in STANDARD_FLEET)
+
+
+def encode_turn(turn: Dict) -> Dict:
+    """
+    Make the result of Game.play_turn JSON serializable.
+
+    Enums become their names and positions become [row, col] lists.
+
+    Args:
+        turn: Dictionary returned by Game.play_turn
+
+    Returns:
+        Dict: The same information with JSON types only
+    """
+    encoded = {}
+    for key, value in turn.items():
+        if isinstance(value, Enum):
+            value = value.name
+        elif isinstance(value, tuple):
+            value = list(value)
+        encoded[key] = value
+    return encoded
+
+
+def _field(request: Dict[str, Any], name: str) -> Any:
+    """Get a required field of a request, raising ValueError if it is missing."""
+    if name not in request:
+        raise ValueError(f"Missing field '{name}'")
+    return request[name]
+
+
+def _int_field(request: Dict[str, Any], name: str, default: Optional[int] = None) -> int:
+    """Get an integer field of a request, raising ValueError if it is missing or not an integer."""
+    value = request.get(name, default) if default is not None else _field(request, name)
+    # JSON true/false decode to bools, which are ints too
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise ValueError(f"Field '{name}' must be an integer")
+    return value
+
+
+class GameServer:
+    """
+    Hosts many Game sessions in one asyncio event loop.
+
+    Clients speak newline-delimited JSON over TCP. Every request is an object
+    with an "op" and an optional "id" echoed in the response:
+
+        {"op": "new", "strategy": "probability", "board_size": 10}
+            -> {"session": "1"}
+        {"op": "shoot", "session": "1", "row": 3, "col": 4}
+            -> the Game.play_turn result
+        {"op": "close", "session": "1"}
+            -> {"closed": true}
+
+    Failed requests get {"error": message}. Setting up games and playing
+    turns, which run the AI strategy, happen on an executor so the event loop
+    keeps serving other connections meanwhile. With a MoveBatcher, the AI
+    moves of concurrent sessions are chosen together in batches instead, and
+    only the cheap rest of each turn runs on the loop. Requests on the same
+    session are handled one at a time. Sessions live in a SessionStore, so
+    idle games are packed into a few hundred bytes each.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765, executor: Optional[Executor] = None,
+                 max_sessions: int = 1000000, batcher: Optional[MoveBatcher] = None,
+                 max_live_sessions: int = 10000, max_board_size: int = 20):
+        """
+        Initialize the server.
+
+        Args:
+            host: Interface to listen on
+            port: TCP port to listen on; 0 picks a free one
+            executor: Executor running game logic (default: a thread pool)
+            max_sessions: Most sessions open at once
+            batcher: Batcher choosing AI moves across sessions (default: one executor call per turn)
+            max_live_sessions: Most sessions kept as live games; the least
+                recently used others are packed
+            max_board_size: Largest board clients may ask for; every size
+                used builds a placement table kept for the life of the process
+        """
+        self.host = host
+        self.port = port
+        self.executor = executor if executor is not None else ThreadPoolExecutor()
+        self.max_sessions = max_sessions
+        self.max_board_size = max_board_size
+        self.batcher = batcher
+        self.sessions = SessionStore(max_live_sessions)
+        # Locks only exist while a request on their session is running or waiting
+        self.locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+        self.session_ids = itertools.count(1)
+        self.server: Optional[asyncio.base_events.Server] = None
+
+    async def start(self):
+        """Start listening; the bound port is stored in self.port."""
+        self.server = await asyncio.start_server(self._handle_connection, self.host, self.port, limit=MAX_LINE)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        """Start the server if needed and serve until cancelled."""
+        if self.server is None:
+            await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self):
+        """Stop listening and wait for the listener to shut down."""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Answer the requests of one connection, in order, until it closes."""
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    writer.write(b'{"error": "Request too long"}\n')
+                    break
+                if not line:
+                    break
+
+                response = await self.handle_line(line)
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def handle_line(self, line: bytes) -> Dict[str, Any]:
+        """
+        Answer one request line.
+
+        Args:
+            line: A JSON encoded request
+
+        Returns:
+            Dict[str, Any]: The response, carrying the request's "id" if it had one
+        """
+        try:
+            request = json.loads(line)
+        except ValueError:
+            return {"error": "Invalid JSON"}
+        if not isinstance(request, dict):
+            return {"error": "Request must be a JSON object"}
+
+        try:
+            response = await self.handle_request(request)
+        except (KeyError, TypeError, ValueError) as error:
+            # KeyError quotes its message, so unwrap it
+            response = {"error": str(error.args[0]) if error.args else type(error).__name__}
+
+        if "id" in request:
+            response["id"] = request["id"]
+        return response
+
+    async def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Dispatch one decoded request.
+
+        Args:
+            request: The request object
+
+        Returns:
+            Dict[str, Any]: The response
+
+        Raises:
+            KeyError: If the operation, strategy or session is unknown
+            ValueError: If an argument is invalid
+        """
+        op = request.get("op")
+        if op == "new":
+            return await self.new_session(str(request.get("strategy", "random")),
+                                          _int_field(request, "board_size", 10))
+        if op == "shoot":
+            return await self.shoot(str(_field(request, "session")), _int_field(request, "row"),
+                                    _int_field(request, "col"))
+        if op == "close":
+            return {"closed": self.close_session(str(_field(request, "session")))}
+        raise KeyError(f"Unknown op '{op}'")
+
+    async def new_session(self, strategy_name: str, board_size: int = 10) -> Dict[str, Any]:
+        """
+        Create a game against an AI strategy.
+
+        Args:
+            strategy_name: Name of a registered strategy
+            board_size: Size of the board
+
+        Returns:
+            Dict[str, Any]: {"session": id} of the new game
+
+        Raises:
+            KeyError: If the strategy is unknown
+            ValueError: If the board size is out of range or the server is full
+        """
+        if not MIN_BOARD_SIZE <= board_size <= self.max_board_size:
+            raise ValueError(f"Board size must be between {MIN_BOARD_SIZE} and {self.max_board_size}")
+        if len(self.sessions) >= self.max_sessions:
+            raise ValueError("Too many sessions")
+        strategy_cls = get_strategy(strategy_name)
+
+        def setup() -> Game:
+            game = Game(board_size, strategy_cls(board_size))
+            game.setup_game()
+            return game
+
+        game = await asyncio.get_running_loop().run_in_executor(self.executor, setup)
+        session = str(next(self.session_ids))
+        self.sessions.put(session, game)
+        return {"session": session}
+
+    async def shoot(self, session: str, row: int, col: int) -> Dict[str, Any]:
+        """
+        Play one turn of a session: the player's shot, then the AI's.
+
+        Args:
+            session: Session id
+            row: Row of the player's shot
+            col: Column of the player's shot
+
+        Returns:
+            Dict[str, Any]: The JSON form of Game.play_turn's result
+
+        Raises:
+            KeyError: If the session is unknown
+            ValueError: If the shot is off the board
+        """
+        if session not in self.sessions:
+            raise KeyError(f"Unknown session '{session}'")
+        lock = self.locks.get(session)
+        if lock is None:
+            lock = self.locks[session] = asyncio.Lock()
+
+        async with lock:
+            # Pinned so the store doesn't pack it while this turn awaits
+            game = self.sessions.acquire(session)
+            if game is None:
+                raise KeyError(f"Unknown session '{session}'")
+            try:
+                if not (0 <= row < game.board_size and 0 <= col < game.board_size):
+                    raise ValueError(f"Shot ({row}, {col}) is off the board")
+
+                if self.batcher is not None:
+                    # The AI's move doesn't depend on the player's shot, so choose it first
+                    ai_shot = None if game.game_over else await self.batcher.next_shot(game.ai_strategy)
+                    turn = game.play_turn((row, col), ai_shot)
+                else:
+                    turn = await asyncio.get_running_loop().run_in_executor(self.executor, game.play_turn,
+                                                                            (row, col))
+            finally:
+                self.sessions.release(session)
+        return encode_turn(turn)
+
+    def close_session(self, session: str) -> bool:
+        """
+        Drop a session.
+
+        Args:
+            session: Session id
+
+        Returns:
+            bool: Whether the session existed
+        """
+        return self.sessions.discard(session)
+
+
+def main():
+    """Run a game server from the command line."""
+    parser = argparse.ArgumentParser(description="Host Battleship games over newline-delimited JSON on TCP.")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on (default: 8765)")
+    parser.add_argument("--workers", type=int, default=None, help="Threads running game logic")
+    parser.add_argument("--batch-window", type=float, default=None,
+                        help="Batch AI moves arriving within this many seconds (default: no batching)")
+    parser.add_argument("--max-board-size", type=int, default=20,
+                        help="Largest board size clients may ask for (default: 20)")
+    parser.add_argument("--max-live-sessions", type=int, default=10000,
+                        help="Sessions kept as live games; idle ones beyond this are packed (default: 10000)")
+    args = parser.parse_args()
+
+    executor = ThreadPoolExecutor(args.workers)
+    batcher = MoveBatcher(args.batch_window, executor=executor) if args.batch_window is not None else None
+    server = GameServer(args.host, args.port, executor, batcher=batcher,
+                        max_live_sessions=args.max_live_sessions, max_board_size=args.max_board_size)
+    print(f"Serving strategies {', '.join(available_strategies())} on {args.host}:{args.port}")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+from collections import OrderedDict
+from typing import Dict, Iterator, Optional, Tuple, Type
+
+from battleship.core import Board
+from battleship.game import Game
+
+
+class SessionStore:
+    """
+    Holds game sessions, keeping the most recently used ones live.
+
+    At most max_live games are kept as Game objects. Beyond that, the least
+    recently used game is packed with Game.to_bytes, keeping only the shots
+    of its strategy, which takes a couple of hundred bytes instead of the
+    kilobytes of a live game. It is restored with Game.from_bytes the next
+    time its session is used. Games in use can be pinned with acquire so
+    they are not evicted while a caller still holds them.
+    """
+
+    def __init__(self, max_live: int = 10000, board_cls: Type[Board] = Board):
+        """
+        Initialize an empty store.
+
+        Args:
+            max_live: Most games kept as live objects
+            board_cls: Board implementation packed games are restored with (default: Board)
+        """
+        self.max_live = max_live
+        self.board_cls = board_cls
+        self.live: "OrderedDict[str, Game]" = OrderedDict()
+        self.packed: Dict[str, bytes] = {}
+        self.pins: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        """Number of sessions, live or packed."""
+        return len(self.live) + len(self.packed)
+
+    def __contains__(self, session: str) -> bool:
+        """Whether a session is in the store."""
+        return session in self.live or session in self.packed
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the session ids."""
+        yield from list(self.live)
+        yield from list(self.packed)
+
+    def put(self, session: str, game: Game):
+        """
+        Add or replace a session as the most recently used one.
+
+        Args:
+            session: Session id
+            game: The session's game
+        """
+        self.packed.pop(session, None)
+        self.live[session] = game
+        self.live.move_to_end(session)
+        self._evict()
+
+    def get(self, session: str) -> Optional[Game]:
+        """
+        Get a session's game, unpacking it if it was evicted.
+
+        Args:
+            session: Session id
+
+        Returns:
+            Optional[Game]: The live game, or None if the session is unknown
+        """
+        game = self._load(session)
+        self._evict()
+        return game
+
+    def acquire(self, session: str) -> Optional[Game]:
+        """
+        Get a session's game and pin it live until release is called.
+
+        Args:
+            session: Session id
+
+        Returns:
+            Optional[Game]: The live game, or None if the session is unknown
+        """
+        game = self._load(session)
+        if game is not None:
+            # Pin before evicting so the game handed out stays the live one
+            self.pins[session] = self.pins.get(session, 0) + 1
+        self._evict()
+        return game
+
+    def release(self, session: str):
+        """
+        Unpin a session acquired earlier.
+
+        Args:
+            session: Session id
+        """
+        pins = self.pins.get(session, 0) - 1
+        if pins > 0:
+            self.pins[session] = pins
+        else:
+            self.pins.pop(session, None)
+            self._evict()
+
+    def discard(self, session: str) -> bool:
+        """
+        Remove a session without restoring it if it is packed.
+
+        Args:
+            session: Session id
+
+        Returns:
+            bool: True if the session existed
+        """
+        self.pins.pop(session, None)
+        live = self.live.pop(session, None) is not None
+        packed = self.packed.pop(session, None) is not None
+        return live or packed
+
+    def _load(self, session: str) -> Optional[Game]:
+        """Make a session the most recently used one, unpacking it if needed, without evicting."""
+        game = self.live.get(session)
+        if game is not None:
+            self.live.move_to_end(session)
+            return game
+
+        data = self.packed.pop(session, None)
+        if data is None:
+            return None
+        game = Game.from_bytes(data, self.board_cls)
+        self.live[session] = game
+        return game
+
+    def _evict(self):
+        """Pack the least recently used unpinned games until few enough are live."""
+        excess = len(self.live) - self.max_live
+        if excess <= 0:
+            return
+
+        # Pinned games stay live in their place; the oldest unpinned ones are packed
+        victims = []
+        for session in self.live:
+            if session not in self.pins:
+                victims.append(session)
+                if len(victims) == excess:
+                    break
+        for session in victims:
+            self.packed[session] = self.live.pop(session).to_bytes(derived=False)
+
+    def stats(self) -> Tuple[int, int, int]:
+        """
+        Get the size of the store.
+
+        Returns:
+            Tuple[int, int, int]: Live sessions, packed sessions and bytes of packed data
+        """
+        return len(self.live), len(self.packed), sum(len(data) for data in self.packed.values())
@@ -0,0 +1,232 @@
+import random
+import struct
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from battleship.core import ShipType, STANDARD_FLEET
+from battleship.placements import SunkShip, get_placement_table
+from battleship.sampling import FleetSampler
+from battleship.strategy import Strategy
+
+# Snapshot settings of a SolverStrategy: max_states (u32), samples (u32)
+SOLVER_SETTINGS = struct.Struct("<II")
+
+
+@dataclass
+class Posterior:
+    """Hit probability of every cell given the observations so far."""
+
+    probabilities: np.ndarray  # (board_size, board_size)
+    configurations: int        # Consistent fleets counted, or samples accepted
+    exact: bool                # False if estimated by sampling
+
+
+class PosteriorSolver:
+    """
+    Computes per-cell hit probabilities over every fleet consistent with the shots.
+
+    Fleets are enumerated ship by ship over the shared placement table.
+    Partial fleets covering the same cells are merged into one state with a
+    multiplicity (memoizing the remaining sub-fleet), and states that can no
+    longer cover every hit with the ships left are pruned. The marginals are
+    then read off with a backward pass of completion counts. When the number
+    of states exceeds the budget, the posterior is estimated from fleets drawn
+    by a FleetSampler.
+
+    Positions where the product of every ship's candidate count is far above
+    the budget, such as the whole hunting phase, go straight to sampling
+    instead of filling the budget with states first.
+    """
+
+    # Enumeration is skipped when the product of the candidate counts exceeds
+    # max_states times this; such positions overflow the budget in practice
+    MAX_PRODUCT_RATIO = 500
+
+    def __init__(self, board_size: int = 10, fleet: Sequence[ShipType] = STANDARD_FLEET,
+                 max_states: int = 20000, samples: int = 1000):
+        """
+        Initialize the solver.
+
+        Args:
+            board_size: Size of the board (default: 10x10)
+            fleet: Ships the opponent places (default: the standard fleet)
+            max_states: Most partial fleet states enumerated before falling back to sampling
+            samples: Number of fleets to draw when sampling
+        """
+        self.board_size = board_size
+        self.fleet = tuple(fleet)
+        self.table = get_placement_table(board_size, self.fleet)
+        self.max_states = max_states
+        self.samples = samples
+        self.sampler = FleetSampler(board_size, self.fleet)
+
+    def __deepcopy__(self, memo) -> "PosteriorSolver":
+        """Solvers hold no per-game state, so copies of strategies share them."""
+        return self
+
+    def solve(self, hits: Iterable[Tuple[int, int]], misses: Iterable[Tuple[int, int]],
+              sunk: Optional[Sequence[SunkShip]] = None,
+              rng: Optional[random.Random] = None) -> Posterior:
+        """
+        Compute the hit probability of every cell.
+
+        Args:
+            hits: Positions known to hold a ship
+            misses: Positions known to be water
+            sunk: Ships sunk so far, as built by PlacementTable.sunk_ships, or
+                None if sunk ships are not announced
+            rng: Random number generator used when sampling (default: the global random module)
+
+        Returns:
+            Posterior: Per-cell hit probabilities
+        """
+        hit_mask = self.table.positions_mask(hits)
+        miss_mask = self.table.positions_mask(misses)
+        candidates = self.table.consistent_placements(hit_mask, miss_mask, sunk)
+
+        product = 1
+        for slot_candidates in candidates:
+            product *= len(slot_candidates)
+        weights = None
+        if product <= self.max_states * self.MAX_PRODUCT_RATIO:
+            weights = self._enumerate(hit_mask, candidates)
+        if weights is not None:
+            placement_weights, total = weights
+            exact = True
+        else:
+            if rng is None:
+                rng = random
+            generator = np.random.default_rng(rng.getrandbits(64))
+            placements, log_weights = self.sampler.sample(self.samples, hit_mask, miss_mask, sunk, generator)
+            placement_weights = self.sampler.placement_weights(placements, log_weights)
+            total = len(placements)
+            exact = False
+
+        cell_weights = placement_weights @ self.table.masks
+        if total:
+            probabilities = cell_weights / total
+        else:
+            probabilities = np.zeros(self.table.num_cells)
+        return Posterior(probabilities.reshape(self.board_size, self.board_size), int(total), exact)
+
+    def _enumerate(self, hit_mask: int, candidates: List[List[int]]) -> Optional[Tuple[np.ndarray, int]]:
+        """
+        Count every consistent fleet exactly.
+
+        Returns:
+            The number of consistent fleets containing each placement and the
+            total number of consistent fleets, or None if over budget
+        """
+        bitmasks = self.table.bitmasks
+
+        # Most constrained ships first keeps the number of states small
+        order = sorted(range(len(candidates)), key=lambda slot: len(candidates[slot]))
+        remaining = [0] * (len(order) + 1)
+        for depth in range(len(order) - 1, -1, -1):
+            remaining[depth] = remaining[depth + 1] + self.fleet[order[depth]].value
+
+        # Forward pass: ways to reach each set of occupied cells
+        levels: List[Dict[int, int]] = [{0: 1}]
+        states = 1
+        for depth, slot in enumerate(order):
+            level: Dict[int, int] = defaultdict(int)
+            for occupied, ways in levels[-1].items():
+                for placement in candidates[slot]:
+                    mask = bitmasks[placement]
+                    if mask & occupied:
+                        continue
+                    combined = occupied | mask
+                    # Prune states whose uncovered hits outnumber the cells left
+                    if (hit_mask & ~combined).bit_count() > remaining[depth + 1]:
+                        continue
+                    level[combined] += ways
+                if states + len(level) > self.max_states:
+                    return None
+            states += len(level)
+            levels.append(level)
+
+        # Backward pass: completions of each state, and fleets through each placement
+        completions = {occupied: 1 for occupied in levels[-1] if hit_mask & ~occupied == 0}
+        placement_weights = np.zeros(len(self.table), dtype=np.float64)
+        for depth in range(len(order) - 1, -1, -1):
+            previous: Dict[int, int] = {}
+            for occupied, ways in levels[depth].items():
+                count = 0
+                for placement in candidates[order[depth]]:
+                    mask = bitmasks[placement]
+                    if mask & occupied:
+                        continue
+                    completed = completions.get(occupied | mask)
+                    if completed:
+                        count += completed
+                        placement_weights[placement] += ways * completed
+                if count:
+                    previous[occupied] = count
+            completions = previous
+
+        return placement_weights, completions.get(0, 0)
+
+
+class SolverStrategy(Strategy):
+    """A strategy that shoots the unshot cell with the highest posterior hit probability."""
+
+    # Largest settings accepted from a snapshot; beyond these a single shot takes gigabytes
+    MAX_STATES = 1000000
+    MAX_SAMPLES = 10000
+
+    def __init__(self, board_size: int = 10, rng: Optional[random.Random] = None,
+                 fleet: Sequence[ShipType] = STANDARD_FLEET, max_states: int = 20000, samples: int = 1000):
+        """
+        Initialize the strategy.
+
+        Args:
+            board_size: Size of the board (default: 10x10)
+            rng: Random number generator to draw from (default: the global random module)
+            fleet: Ships the opponent places (default: the standard fleet)
+            max_states: Most partial fleet states enumerated before falling back to sampling
+            samples: Number of fleets to draw when sampling
+        """
+        super().__init__(board_size, rng)
+        self.solver = PosteriorSolver(board_size, fleet, max_states, samples)
+
+    def _settings_bytes(self) -> bytes:
+        """Serialize max_states and samples (u32 each), then the fleet as one byte per ship size."""
+        solver = self.solver
+        return SOLVER_SETTINGS.pack(solver.max_states, solver.samples) + bytes(
+            ship_type.value for ship_type in solver.fleet)
+
+    @classmethod
+    def _from_settings(cls, board_size: int, rng: Optional[random.Random], settings: bytes) -> "Strategy":
+        """Construct a reset strategy with the settings saved by _settings_bytes."""
+        max_states, samples = SOLVER_SETTINGS.unpack_from(settings)
+        if max_states > cls.MAX_STATES:
+            raise ValueError(f"Snapshot max_states {max_states} is above {cls.MAX_STATES}")
+        if not 1 <= samples <= cls.MAX_SAMPLES:
+            raise ValueError(f"Snapshot samples {samples} is not between 1 and {cls.MAX_SAMPLES}")
+        fleet = [ShipType(size) for size in settings[SOLVER_SETTINGS.size:]]
+        return cls(board_size, rng, fleet, max_states, samples)
+
+    def get_next_shot(self) -> Tuple[int, int]:
+        """
+        Choose the unshot position most likely to hold a ship.
+
+        Returns:
+            Tuple[int, int]: The (row, col) position to target
+        """
+        if not self.available:
+            # No available positions, return an invalid position
+            return (-1, -1)
+
+        # Without an announcement yet, stay agnostic about whether the game makes them
+        sunk = self.solver.table.sunk_ships(self.hits, self.sunk) if self.sunk else None
+        posterior = self.solver.solve(self.hits, self.misses, sunk, rng=self.rng)
+        probabilities = posterior.probabilities.copy()
+        for row, col in self.shot_set:
+            if 0 <= row < self.board_size and 0 <= col < self.board_size:
+                probabilities[row, col] = -1.0
+
+        row, col = np.unravel_index(int(np.argmax(probabilities)), probabilities.shape)
+        return (int(row), int(col))
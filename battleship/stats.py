@@ -0,0 +1,148 @@
+import math
+from collections import Counter
+from dataclasses import dataclass, field
+from statistics import NormalDist, fmean, stdev
+from typing import Dict, List, Optional, Tuple
+
+
+def z_value(confidence: float) -> float:
+    """
+    Get the two-sided standard normal critical value for a confidence level.
+
+    Args:
+        confidence: Confidence level, e.g. 0.95
+
+    Returns:
+        float: The critical value, e.g. 1.96 for 0.95
+    """
+    return NormalDist().inv_cdf(0.5 + confidence / 2)
+
+
+@dataclass
+class BenchmarkResult:
+    """Distribution of the turns a strategy needed to win a set of games."""
+
+    strategy_name: str
+    turns: List[int]
+    sorted_turns: List[int] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.sorted_turns = sorted(self.turns)
+
+    @property
+    def num_games(self) -> int:
+        """Number of games played."""
+        return len(self.turns)
+
+    @property
+    def mean(self) -> float:
+        """Mean number of turns."""
+        return fmean(self.turns)
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation of the number of turns."""
+        return stdev(self.turns) if len(self.turns) > 1 else 0.0
+
+    @property
+    def stderr(self) -> float:
+        """Standard error of the mean."""
+        return self.std / math.sqrt(len(self.turns))
+
+    @property
+    def min(self) -> int:
+        """Fewest turns needed."""
+        return self.sorted_turns[0]
+
+    @property
+    def max(self) -> int:
+        """Most turns needed."""
+        return self.sorted_turns[-1]
+
+    def percentile(self, q: float) -> float:
+        """
+        Get a percentile of the number of turns, interpolating linearly.
+
+        Args:
+            q: Percentile between 0 and 100
+
+        Returns:
+            float: The percentile
+        """
+        position = (len(self.sorted_turns) - 1) * q / 100
+        lower = math.floor(position)
+        upper = min(lower + 1, len(self.sorted_turns) - 1)
+        fraction = position - lower
+        return self.sorted_turns[lower] * (1 - fraction) + self.sorted_turns[upper] * fraction
+
+    def confidence_interval(self, confidence: float = 0.95) -> Tuple[float, float]:
+        """
+        Get a normal-approximation confidence interval for the mean.
+
+        Args:
+            confidence: Confidence level (default: 0.95)
+
+        Returns:
+            Tuple[float, float]: Lower and upper bound
+        """
+        margin = z_value(confidence) * self.stderr
+        return (self.mean - margin, self.mean + margin)
+
+    def histogram(self) -> Dict[int, int]:
+        """Number of games won in each turn count, in increasing turn order."""
+        return dict(sorted(Counter(self.turns).items()))
+
+    def summary(self) -> str:
+        """Format the result as a short multi-line report."""
+        low, high = self.confidence_interval()
+        return "\n".join([
+            f"Average turns for {self.strategy_name} to win: {self.mean:.1f}",
+            f"  games: {self.num_games}, std: {self.std:.2f}, std error: {self.stderr:.3f}",
+            f"  95% CI: [{low:.2f}, {high:.2f}]",
+            f"  min: {self.min}, p5: {self.percentile(5):.1f}, median: {self.percentile(50):.1f}, "
+            f"p95: {self.percentile(95):.1f}, max: {self.max}",
+        ])
+
+
+@dataclass
+class ComparisonResult:
+    """Outcome of a paired comparison between two strategies."""
+
+    result_a: BenchmarkResult
+    result_b: BenchmarkResult
+    confidence: float
+    mean_difference: float
+    stderr: float
+    decided: bool
+
+    @property
+    def num_games(self) -> int:
+        """Number of games each strategy played."""
+        return self.result_a.num_games
+
+    @property
+    def better(self) -> Optional[str]:
+        """Name of the strategy needing fewer turns, or None if undecided."""
+        if not self.decided:
+            return None
+        if self.mean_difference < 0:
+            return self.result_a.strategy_name
+        return self.result_b.strategy_name
+
+
+def paired_difference(turns_a: List[int], turns_b: List[int]) -> Tuple[float, float]:
+    """
+    Get the mean and standard error of per-game turn differences.
+
+    Args:
+        turns_a: Turns of the first strategy, game by game
+        turns_b: Turns of the second strategy on the same boards
+
+    Returns:
+        Tuple[float, float]: Mean difference (a - b) and its standard error
+    """
+    differences = [a - b for a, b in zip(turns_a, turns_b)]
+    mean = fmean(differences)
+    if len(differences) < 2:
+        return (mean, math.inf)
+    return (mean, stdev(differences) / math.sqrt(len(differences)))
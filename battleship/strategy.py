@@ -1,24 +1,56 @@
 from abc import ABC, abstractmethod
-from typing import Tuple, List
+from collections import deque
+from functools import lru_cache
+from typing import Deque, Dict, Iterator, Tuple, List, Optional, Sequence, Set
 import random
+import struct
 
-from battleship.core import CellState
+from battleship.core import CellState, ShipType, STANDARD_FLEET
+from battleship.gamelog import GameRecord, encode_shots
+from battleship.placements import get_placement_table
+
+# Strategy snapshot layout (little endian):
+#   header:   version (u8), board size (u16), bytes of settings, shots and state (u32 each)
+#   settings: constructor arguments of the strategy class beyond board size and rng
+#   shots:    the shots registered so far, in order, as game log units
+#   state:    derived state of the strategy class, empty when it is rebuilt by
+#             replaying the shots
+STRATEGY_VERSION = 1
+STRATEGY_HEADER = struct.Struct("<BHIII")
+
+
+@lru_cache(maxsize=None)
+def _board_positions(board_size: int) -> Tuple[Tuple[Tuple[int, int], ...], Dict[Tuple[int, int], int]]:
+    """Every position of a board in row-major order, and each position's index; shared, never modify."""
+    positions = tuple((row, col) for row in range(board_size) for col in range(board_size))
+    return positions, {position: index for index, position in enumerate(positions)}
 
 
 class Strategy(ABC):
     """Abstract base class for battleship shooting strategies."""
 
-    def __init__(self, board_size: int = 10):
+    def __init__(self, board_size: int = 10, rng: Optional[random.Random] = None):
         """
         Initialize the strategy.
 
         Args:
             board_size: Size of the board (default: 10x10)
+            rng: Random number generator to draw from (default: the global random module)
         """
         self.board_size = board_size
+        self.rng = rng if rng is not None else random
         self.shots: List[Tuple[int, int]] = []
+        self.shot_set: Set[Tuple[int, int]] = set()
         self.hits: List[Tuple[int, int]] = []
         self.misses: List[Tuple[int, int]] = []
+        # (position, ship type) of the shot that sank each ship, when the game announces them
+        self.sunk: List[Tuple[Tuple[int, int], ShipType]] = []
+
+        # Pool of unshot positions with each position's index in it, so a shot
+        # is removed by swapping it with the last entry
+        self.all_positions, self.all_position_index = _board_positions(board_size)
+        self.available: List[Tuple[int, int]] = list(self.all_positions)
+        self.available_index: Dict[Tuple[int, int], int] = dict(self.all_position_index)
 
     @abstractmethod
     def get_next_shot(self) -> Tuple[int, int]:
@@ -30,21 +62,33 @@ class Strategy(ABC):
         """
         pass
 
-    def register_result(self, position: Tuple[int, int], result: CellState):
+    def register_result(self, position: Tuple[int, int], result: CellState, sunk: Optional[ShipType] = None):
         """
         Register the result of a shot.
 
         Args:
             position: The (row, col) position that was shot
             result: The result of the shot (HIT or MISS)
+            sunk: Type of the ship the shot sank, if the game announces it
         """
         self.shots.append(position)
+        self.shot_set.add(position)
+
+        index = self.available_index.pop(position, None)
+        if index is not None:
+            last = self.available.pop()
+            if last != position:
+                self.available[index] = last
+                self.available_index[last] = index
 
         if result == CellState.HIT:
             self.hits.append(position)
         elif result == CellState.MISS:
             self.misses.append(position)
 
+        if sunk is not None:
+            self.sunk.append((position, sunk))
+
     def get_available_positions(self) -> List[Tuple[int, int]]:
         """
         Get all positions that haven't been shot at yet.
@@ -52,18 +96,145 @@ class Strategy(ABC):
         Returns:
             List[Tuple[int, int]]: List of available positions
         """
-        return [
-            (row, col)
-            for row in range(self.board_size)
-            for col in range(self.board_size)
-            if (row, col) not in self.shots
-        ]
+        return list(self.available)
+
+    def has_shot(self, position: Tuple[int, int]) -> bool:
+        """Check in constant time whether a position has already been shot at."""
+        return position in self.shot_set
 
     def reset(self):
         """Reset the strategy state."""
         self.shots = []
+        self.shot_set = set()
         self.hits = []
         self.misses = []
+        self.sunk = []
+        self.available = list(self.all_positions)
+        self.available_index = dict(self.all_position_index)
+
+    def _shot_results(self) -> Iterator[Tuple[Tuple[int, int], CellState, Optional[ShipType]]]:
+        """Yield every registered shot with its result and the ship it sank, in order."""
+        hits = set(self.hits)
+        sunk = dict(self.sunk)
+        for position in self.shots:
+            yield position, CellState.HIT if position in hits else CellState.MISS, sunk.get(position)
+
+    def _settings_bytes(self) -> bytes:
+        """Serialize the constructor arguments beyond board_size and rng; empty if there are none."""
+        return b""
+
+    @classmethod
+    def _from_settings(cls, board_size: int, rng: Optional[random.Random], settings: bytes) -> "Strategy":
+        """
+        Construct a reset strategy from what _settings_bytes returned.
+
+        Classes taking further constructor arguments override this together
+        with _settings_bytes.
+
+        Args:
+            board_size: Size of the board
+            rng: Random number generator to draw from
+            settings: What _settings_bytes returned
+
+        Returns:
+            Strategy: The new strategy
+
+        Raises:
+            ValueError: If there are settings this class does not take
+        """
+        if settings:
+            raise ValueError(f"{cls.__name__} takes no snapshot settings")
+        return cls(board_size, rng)
+
+    def _state_bytes(self) -> bytes:
+        """Serialize state derived from the shots; empty if replaying them is cheap enough."""
+        return b""
+
+    def _restore_state(self, shots: List[Tuple[Tuple[int, int], CellState, Optional[ShipType]]], state: bytes):
+        """
+        Bring a reset strategy to the state it had after some shots.
+
+        The base implementation replays the shots through register_result.
+        Classes whose _state_bytes returns derived state override this to
+        load that state instead when it is present.
+
+        Args:
+            shots: The position and result of each shot, and the ship it sank if any
+            state: What _state_bytes returned, possibly empty
+        """
+        for position, result, sunk in shots:
+            self.register_result(position, result, sunk)
+
+    def _restore_shots(self, shots: List[Tuple[Tuple[int, int], CellState, Optional[ShipType]]]):
+        """Register shots with the base class bookkeeping only, for subclasses loading their own state."""
+        for position, result, sunk in shots:
+            Strategy.register_result(self, position, result, sunk)
+
+    def to_bytes(self, derived: bool = True) -> bytes:
+        """
+        Serialize the strategy.
+
+        The constructor settings and the shots registered so far, in game log
+        units, are stored together with any derived state the class keeps
+        (see _state_bytes). The random generator is not stored.
+
+        Args:
+            derived: Whether to include the derived state, which makes
+                from_bytes faster at the cost of a larger snapshot
+
+        Returns:
+            bytes: The snapshot, restored by from_bytes of the same class
+        """
+        settings = self._settings_bytes()
+        units = encode_shots(self.board_size, self._shot_results())
+        state = self._state_bytes() if derived else b""
+        return b"".join((STRATEGY_HEADER.pack(STRATEGY_VERSION, self.board_size, len(settings), len(units),
+                                              len(state)),
+                         settings, units, state))
+
+    @classmethod
+    def from_bytes(cls, data: bytes, rng: Optional[random.Random] = None,
+                   board_size: Optional[int] = None) -> "Strategy":
+        """
+        Restore a strategy serialized with to_bytes.
+
+        The class must be the one that was serialized; it is rebuilt through
+        _from_settings.
+
+        Args:
+            data: The snapshot
+            rng: Random number generator of the restored strategy (default: the global random module)
+            board_size: Board size the snapshot must be for, checked before
+                anything is built; set it for untrusted data (default: any)
+
+        Returns:
+            Strategy: A strategy of this class in the same state
+
+        Raises:
+            ValueError: If the data is not a valid snapshot of a supported version
+        """
+        if len(data) < STRATEGY_HEADER.size:
+            raise ValueError("Truncated strategy snapshot")
+        version, size, settings_length, units_length, state_length = STRATEGY_HEADER.unpack_from(data)
+        if version != STRATEGY_VERSION:
+            raise ValueError(f"Unsupported strategy snapshot version {version}")
+        if board_size is not None and size != board_size:
+            raise ValueError(f"Strategy snapshot is for a {size}x{size} board, not {board_size}x{board_size}")
+        board_size = size
+        settings_end = STRATEGY_HEADER.size + settings_length
+        units_end = settings_end + units_length
+        if len(data) != units_end + state_length:
+            raise ValueError("Strategy snapshot has the wrong length")
+
+        try:
+            shots = list(GameRecord(board_size, [], bytes(data[settings_end:units_end])).shots())
+            if any(not (0 <= row < board_size and 0 <= col < board_size) for (row, col), _, _ in shots):
+                raise ValueError("Strategy snapshot has shots off the board")
+            strategy = cls._from_settings(board_size, rng, bytes(data[STRATEGY_HEADER.size:settings_end]))
+            strategy._restore_state(shots, bytes(data[units_end:]))
+        except (struct.error, TypeError, IndexError, KeyError) as error:
+            raise ValueError(f"Corrupt strategy snapshot: {error}") from error
+        return strategy
 
 
 class RandomStrategy(Strategy):
@@ -76,10 +247,340 @@ class RandomStrategy(Strategy):
         Returns:
             Tuple[int, int]: The (row, col) position to target
         """
-        available = self.get_available_positions()
-        if not available:
+        if not self.available:
             # No available positions, return an invalid position
             return (-1, -1)
 
-        return random.choice(available)
+        return self.rng.choice(self.available)
+
+
+
+class HuntTargetStrategy(Strategy):
+    """
+    A strategy that hunts on a checkerboard and targets the neighbors of hits.
+
+    While hunting it only shoots cells of one parity, since every ship is at
+    least two cells long. Each hit queues its unshot neighbors, which are
+    fired at before hunting resumes. When the game announces sunk ships and
+    every hit so far belongs to a sunk ship, the queue is dropped and hunting
+    resumes right away.
+    """
+
+    def __init__(self, board_size: int = 10, rng: Optional[random.Random] = None):
+        """
+        Initialize the strategy.
+
+        Args:
+            board_size: Size of the board (default: 10x10)
+            rng: Random number generator to draw from (default: the global random module)
+        """
+        super().__init__(board_size, rng)
+        self.reset()
+
+    def reset(self):
+        """Reset the strategy state."""
+        super().reset()
+
+        cells = [(row, col) for row in range(self.board_size) for col in range(self.board_size)]
+        parity = [cell for cell in cells if (cell[0] + cell[1]) % 2 == 0]
+        rest = [cell for cell in cells if (cell[0] + cell[1]) % 2 == 1]
+        self.rng.shuffle(parity)
+        self.rng.shuffle(rest)
+
+        # Parity cells first; the rest only matters if hunting runs dry
+        self.hunt_order: List[Tuple[int, int]] = parity + rest
+        self.hunt_index = 0
+        self.targets: Deque[Tuple[int, int]] = deque()
+        # Hits not yet accounted for by an announced sunk ship
+        self.open_hits = 0
+
+    def _state_bytes(self) -> bytes:
+        """
+        Serialize the hunting state.
+
+        The hunt index, open hits and number of queued targets (u16 each),
+        then the hunt order and the queued targets as u16 cells.
+
+        Returns:
+            bytes: The state, restored by _restore_state
+        """
+        size = self.board_size
+        cells = [row * size + col for row, col in self.hunt_order]
+        cells.extend(row * size + col for row, col in self.targets)
+        return struct.pack(f"<3H{len(cells)}H", self.hunt_index, self.open_hits, len(self.targets), *cells)
+
+    def _restore_state(self, shots: List[Tuple[Tuple[int, int], CellState, Optional[ShipType]]], state: bytes):
+        """
+        Load the hunting state saved by _state_bytes instead of replaying the shots.
+
+        Args:
+            shots: The position and result of each shot, and the ship it sank if any
+            state: What _state_bytes returned, possibly empty
+
+        Raises:
+            ValueError: If the state was saved for a different board
+        """
+        if not state:
+            super()._restore_state(shots, state)
+            return
+
+        size = self.board_size
+        if len(state) < 6:
+            raise ValueError("Strategy state does not match this board")
+        hunt_index, open_hits, num_targets = struct.unpack_from("<3H", state)
+        if len(state) != 6 + 2 * (size * size + num_targets):
+            raise ValueError("Strategy state does not match this board")
+        cells = struct.unpack_from(f"<{size * size + num_targets}H", state, 6)
+        if max(cells, default=0) >= size * size:
+            raise ValueError("Strategy state does not match this board")
+
+        self._restore_shots(shots)
+        positions = self.all_positions
+        self.hunt_order = [positions[cell] for cell in cells[:size * size]]
+        self.hunt_index = hunt_index
+        self.targets = deque(positions[cell] for cell in cells[size * size:])
+        self.open_hits = open_hits
+
+    def get_next_shot(self) -> Tuple[int, int]:
+        """
+        Shoot the next queued target, or the next unshot hunting cell.
+
+        Returns:
+            Tuple[int, int]: The (row, col) position to target
+        """
+        while self.targets:
+            position = self.targets.popleft()
+            if not self.has_shot(position):
+                return position
+
+        while self.hunt_index < len(self.hunt_order):
+            position = self.hunt_order[self.hunt_index]
+            self.hunt_index += 1
+            if not self.has_shot(position):
+                return position
+
+        # No available positions, return an invalid position
+        return (-1, -1)
+
+    def register_result(self, position: Tuple[int, int], result: CellState, sunk: Optional[ShipType] = None):
+        """
+        Register the result of a shot, queueing neighbors of hits.
+
+        Args:
+            position: The (row, col) position that was shot
+            result: The result of the shot (HIT or MISS)
+            sunk: Type of the ship the shot sank, if the game announces it
+        """
+        fresh = not self.has_shot(position)
+        super().register_result(position, result, sunk)
+
+        if result == CellState.HIT and fresh:
+            self.open_hits += 1
+            row, col = position
+            for neighbor in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)):
+                if (0 <= neighbor[0] < self.board_size and 0 <= neighbor[1] < self.board_size
+                        and not self.has_shot(neighbor)):
+                    self.targets.append(neighbor)
+
+        if sunk is not None:
+            self.open_hits -= sunk.value
+            if self.open_hits <= 0:
+                self.open_hits = 0
+                self.targets.clear()
+
+
+class ProbabilityStrategy(Strategy):
+    """
+    A strategy that shoots the cell covered by the most legal ship placements.
+
+    Every placement of every remaining ship that avoids known misses adds its
+    weight to the cells it covers; placements through known hits weigh more so
+    the strategy finishes off ships it has found. Shot results only touch the
+    placements that cover the shot cell, so the density is kept up to date
+    incrementally instead of being recounted each turn.
+
+    When a sunk ship is announced, that ship leaves the remaining fleet and
+    no other ship may cover the cells it certainly occupied, so the hits it
+    leaves behind stop drawing shots.
+    """
+
+    # Weight multiplier for each known hit a placement covers
+    TARGET_WEIGHT = 20
+
+    def __init__(self, board_size: int = 10, rng: Optional[random.Random] = None,
+                 fleet: Sequence[ShipType] = STANDARD_FLEET):
+        """
+        Initialize the strategy.
+
+        Args:
+            board_size: Size of the board (default: 10x10)
+            rng: Random number generator to draw from (default: the global random module)
+            fleet: Ships the opponent places (default: the standard fleet)
+        """
+        super().__init__(board_size, rng)
+        self.fleet = tuple(fleet)
+        self.table = get_placement_table(board_size, self.fleet)
+        longest = max(ship_type.value for ship_type in self.fleet)
+        self.weights = [self.TARGET_WEIGHT ** hits for hits in range(longest + 1)]
+        self.reset()
+
+    def reset(self):
+        """Reset the strategy state."""
+        super().reset()
+        self.density = list(self.table.coverage)
+        self.open_cells = [True] * (self.board_size * self.board_size)
+        self.placement_valid = [True] * len(self.table)
+        self.placement_hits = [0] * len(self.table)
+        self.sunk_slots: Set[int] = set()
+
+    def _settings_bytes(self) -> bytes:
+        """Serialize the fleet as one byte per ship size."""
+        return bytes(ship_type.value for ship_type in self.fleet)
+
+    @classmethod
+    def _from_settings(cls, board_size: int, rng: Optional[random.Random], settings: bytes) -> "Strategy":
+        """Construct a reset strategy for the fleet saved by _settings_bytes."""
+        return cls(board_size, rng, fleet=[ShipType(size) for size in settings])
+
+    def _state_bytes(self) -> bytes:
+        """
+        Serialize the placement state.
+
+        One byte per placement for whether it is still valid, one per
+        placement for the hits it covers, the density as an i64 per cell and
+        a byte per sunk fleet slot.
+
+        Returns:
+            bytes: The state, restored by _restore_state
+        """
+        return b"".join((bytes(self.placement_valid), bytes(self.placement_hits),
+                         struct.pack(f"<{len(self.density)}q", *self.density), bytes(sorted(self.sunk_slots))))
+
+    def _restore_state(self, shots: List[Tuple[Tuple[int, int], CellState, Optional[ShipType]]], state: bytes):
+        """
+        Load the placement state saved by _state_bytes instead of replaying the shots.
+
+        Args:
+            shots: The position and result of each shot, and the ship it sank if any
+            state: What _state_bytes returned, possibly empty
+
+        Raises:
+            ValueError: If the state was saved for a different board or fleet
+        """
+        if not state:
+            super()._restore_state(shots, state)
+            return
+
+        placements = len(self.table)
+        cells = self.board_size * self.board_size
+        density_end = 2 * placements + 8 * cells
+        if (len(state) < density_end or any(slot >= len(self.fleet) for slot in state[density_end:])
+                or max(state[placements:2 * placements], default=0) >= len(self.weights)):
+            raise ValueError("Strategy state does not match this board and fleet")
+
+        # Only the shot lists of the base class, the rest comes from the state
+        self._restore_shots(shots)
+        for row, col in self.shots:
+            if 0 <= row < self.board_size and 0 <= col < self.board_size:
+                self.open_cells[row * self.board_size + col] = False
+
+        self.placement_valid = list(map(bool, state[:placements]))
+        self.placement_hits = list(state[placements:2 * placements])
+        self.density = list(struct.unpack_from(f"<{cells}q", state, 2 * placements))
+        self.sunk_slots = set(state[density_end:])
+
+    def _invalidate(self, placement: int):
+        """Rule a placement out and remove its weight from the density."""
+        self.placement_valid[placement] = False
+        delta = self.weights[self.placement_hits[placement]]
+        for covered in self.table.cells[placement]:
+            self.density[covered] -= delta
+
+    def register_result(self, position: Tuple[int, int], result: CellState, sunk: Optional[ShipType] = None):
+        """
+        Register the result of a shot and update the placement density.
+
+        Args:
+            position: The (row, col) position that was shot
+            result: The result of the shot (HIT or MISS)
+            sunk: Type of the ship the shot sank, if the game announces it
+        """
+        super().register_result(position, result, sunk)
+
+        row, col = position
+        if not (0 <= row < self.board_size and 0 <= col < self.board_size):
+            return
+        cell = row * self.board_size + col
+        if not self.open_cells[cell]:
+            return
+        self.open_cells[cell] = False
+
+        density = self.density
+        for placement in self.table.cell_placements[cell]:
+            if not self.placement_valid[placement]:
+                continue
+
+            hits = self.placement_hits[placement]
+            if result == CellState.HIT:
+                # Placement now covers one more hit
+                delta = self.weights[hits + 1] - self.weights[hits]
+                self.placement_hits[placement] = hits + 1
+            else:
+                # A miss rules the placement out
+                delta = -self.weights[hits]
+                self.placement_valid[placement] = False
+
+            for covered in self.table.cells[placement]:
+                density[covered] += delta
+
+        if sunk is not None:
+            self._register_sunk(cell, sunk)
+
+    def _register_sunk(self, cell: int, ship_type: ShipType):
+        """Remove a sunk ship from the remaining fleet and free the cells it certainly took."""
+        slot = next((slot for slot, fleet_type in enumerate(self.fleet)
+                     if fleet_type == ship_type and slot not in self.sunk_slots), None)
+        if slot is None:
+            return
+        self.sunk_slots.add(slot)
+
+        # Still-valid placements of the slot through the sinking shot that lie on hits only
+        size = ship_type.value
+        candidates = [placement for placement in self.table.ship_placements[slot]
+                      if self.placement_valid[placement] and self.placement_hits[placement] == size
+                      and cell in self.table.cells[placement]]
+        for placement in self.table.ship_placements[slot]:
+            if self.placement_valid[placement]:
+                self._invalidate(placement)
+
+        if not candidates:
+            return
+        certain = set(self.table.cells[candidates[0]])
+        for placement in candidates[1:]:
+            certain.intersection_update(self.table.cells[placement])
+
+        # No other ship can cover a cell the sunk ship occupied
+        for covered in certain:
+            for placement in self.table.cell_placements[covered]:
+                if self.placement_valid[placement]:
+                    self._invalidate(placement)
+
+    def get_next_shot(self) -> Tuple[int, int]:
+        """
+        Choose the open cell with the highest placement density.
+
+        Returns:
+            Tuple[int, int]: The (row, col) position to target
+        """
+        best_cell = -1
+        best_density = -1
+        for cell, density in enumerate(self.density):
+            if density > best_density and self.open_cells[cell]:
+                best_cell = cell
+                best_density = density
+
+        if best_cell < 0:
+            # No available positions, return an invalid position
+            return (-1, -1)
 
+        return divmod(best_cell, self.board_size)
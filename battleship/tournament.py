@@ -0,0 +1,174 @@
+import math
+import random
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Type
+
+from battleship.benchmark import simulate_games
+from battleship.core import Board
+from battleship.registry import available_strategies, get_strategy
+
+
+@dataclass
+class TournamentResult:
+    """Outcome of a round-robin tournament between strategies."""
+
+    names: List[str]
+    turns: Dict[str, List[int]]
+    scores: List[List[float]]
+    ratings: Dict[str, float]
+
+    def ranking(self) -> List[str]:
+        """Strategy names from the highest rated to the lowest."""
+        return sorted(self.names, key=self.ratings.__getitem__, reverse=True)
+
+    def summary(self) -> str:
+        """Format the win-rate matrix and ratings as a table."""
+        width = max(len(name) for name in self.names)
+        lines = [" " * width + "".join(f" {name[:8]:>8}" for name in self.names) + "      Elo"]
+        for i, name in enumerate(self.names):
+            cells = "".join("        -" if i == j else f" {self.scores[i][j]:8.3f}" for j in range(len(self.names)))
+            lines.append(f"{name:>{width}}{cells} {self.ratings[name]:8.1f}")
+        return "\n".join(lines)
+
+
+def head_to_head(turns_a: List[int], turns_b: List[int]) -> float:
+    """
+    Score two strategies that played the same boards.
+
+    On each board the strategy that sank the fleet in fewer turns wins, and
+    equal turn counts are a draw.
+
+    Args:
+        turns_a: Turns of the first strategy, board by board
+        turns_b: Turns of the second strategy on the same boards
+
+    Returns:
+        float: Share of the points won by the first strategy
+    """
+    points = 0.0
+    for a, b in zip(turns_a, turns_b):
+        if a < b:
+            points += 1.0
+        elif a == b:
+            points += 0.5
+    return points / len(turns_a)
+
+
+def elo_ratings(scores: List[List[float]], games: int, base: float = 1500.0,
+                iterations: int = 1000, tolerance: float = 1e-9) -> List[float]:
+    """
+    Fit Elo ratings to a round-robin score matrix.
+
+    Ratings are the maximum likelihood Bradley-Terry strengths on the Elo
+    scale, found with the minorization-maximization iteration. Every pairing
+    gets one extra virtual draw so strategies that won or lost everything
+    still have finite ratings. Unlike sequential Elo updates, the result does
+    not depend on the order of the games.
+
+    Args:
+        scores: scores[i][j] is the share of points i won against j
+        games: Number of games played by each pairing
+        base: Average rating (default: 1500)
+        iterations: Maximum number of iterations
+        tolerance: Stop once no strength moves by more than this
+
+    Returns:
+        List[float]: Rating of each strategy
+    """
+    count = len(scores)
+    if count < 2:
+        return [base] * count
+
+    played = games + 1
+    wins = [sum(scores[i][j] * games + 0.5 for j in range(count) if j != i) for i in range(count)]
+    strengths = [1.0] * count
+
+    for _ in range(iterations):
+        updated = [
+            wins[i] / sum(played / (strengths[i] + strengths[j]) for j in range(count) if j != i)
+            for i in range(count)
+        ]
+        # Normalize to a geometric mean of 1
+        scale = math.exp(sum(math.log(s) for s in updated) / count)
+        updated = [s / scale for s in updated]
+
+        converged = max(abs(u - s) for u, s in zip(updated, strengths)) < tolerance
+        strengths = updated
+        if converged:
+            break
+
+    return [base + 400 * math.log10(s) for s in strengths]
+
+
+def run_tournament(names: Optional[List[str]] = None, num_boards: int = 1000, seed: Optional[int] = None,
+                   workers: Optional[int] = None, chunk_size: int = 100, board_size: int = 10,
+                   board_cls: Type[Board] = Board, placement: str = "sequential",
+                   corpus: Optional[str] = None) -> TournamentResult:
+    """
+    Play every strategy against every other one on a shared set of boards.
+
+    All strategies play the same seeded boards, so each head-to-head match
+    compares the strategies board by board (paired sampling) and every
+    strategy only plays each board once, however many opponents it has.
+
+    Args:
+        names: Names of the registered strategies taking part (default: all of them)
+        num_boards: Number of boards every strategy plays
+        seed: Master seed choosing the boards
+        workers: Number of worker processes; None or 1 plays in this process
+        chunk_size: Number of games handed to a worker at a time
+        board_size: Size of the board (default: 10x10)
+        board_cls: Board implementation to simulate on
+        placement: Fleet placement mode, "sequential" or "uniform"
+        corpus: Path of a board corpus; the strategies play its first
+            num_boards boards instead of random placements
+
+    Returns:
+        TournamentResult: Turn counts, win-rate matrix and ratings
+    """
+    if names is None:
+        names = available_strategies()
+    strategies = {name: get_strategy(name) for name in names}
+    if seed is None:
+        seed = random.randrange(2 ** 63)
+
+    print(f"Playing {len(names)} strategies on {num_boards} boards (seed {seed})...")
+
+    turns: Dict[str, List[int]] = {name: [] for name in names}
+    jobs = [(name, start, min(start + chunk_size, num_boards))
+            for name in names for start in range(0, num_boards, chunk_size)]
+
+    if workers is None or workers <= 1:
+        for name, start, stop in jobs:
+            turns[name].extend(simulate_games(strategies[name], start, stop, seed, board_cls, board_size,
+                                              placement, corpus))
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        # One pool for every strategy, chunks come back in submission order
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunks = executor.map(simulate_games,
+                                  [strategies[name] for name, _, _ in jobs],
+                                  [start for _, start, _ in jobs],
+                                  [stop for _, _, stop in jobs],
+                                  [seed] * len(jobs),
+                                  [board_cls] * len(jobs),
+                                  [board_size] * len(jobs),
+                                  [placement] * len(jobs),
+                                  [corpus] * len(jobs))
+            for (name, _, _), chunk in zip(jobs, chunks):
+                turns[name].extend(chunk)
+
+    scores = [
+        [0.5 if i == j else head_to_head(turns[a], turns[b]) for j, b in enumerate(names)]
+        for i, a in enumerate(names)
+    ]
+    ratings = dict(zip(names, elo_ratings(scores, num_boards)))
+
+    result = TournamentResult(names, turns, scores, ratings)
+    print(result.summary())
+    return result
+
+
+if __name__ == "__main__":
+    run_tournament()
@@ -1,5 +1,7 @@
-from battleship.strategy import RandomStrategy
+import argparse
+
 from battleship.game import Game
+from battleship.registry import get_strategy
 
 
 def play_interactive_game(strategy_name="random"):
@@ -7,10 +9,11 @@ def play_interactive_game(strategy_name="random"):
     Play an interactive game with the chosen AI strategy.
 
     Args:
-        strategy_name: The name of the strategy to use ('random', 'hunt', or 'probability')
+        strategy_name: Registered name of the strategy to use, e.g. 'random', 'hunt',
+            'probability', 'solver' or 'montecarlo'
     """
-    strategy = RandomStrategy()
-    print("Playing against Random AI strategy")
+    strategy = get_strategy(strategy_name)()
+    print(f"Playing against {strategy_name} AI strategy")
 
     # Initialize and set up the game
     game = Game(ai_strategy=strategy)
@@ -35,10 +38,14 @@ def play_interactive_game(strategy_name="random"):
 
             # Display results
             print(f"\nYour shot at ({row}, {col}) was a {turn_result['player_result'].name}!")
+            if turn_result['player_sunk'] is not None:
+                print(f"You sank the AI's {turn_result['player_sunk'].name}!")
 
             if not game.game_over:
                 ai_row, ai_col = turn_result['ai_shot']
                 print(f"AI shot at ({ai_row}, {ai_col}) was a {turn_result['ai_result'].name}!")
+                if turn_result['ai_sunk'] is not None:
+                    print(f"The AI sank your {turn_result['ai_sunk'].name}!")
 
         except ValueError:
             print("Please enter valid numbers!")
@@ -50,8 +57,19 @@ def play_interactive_game(strategy_name="random"):
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Play Battleship against an AI strategy.")
+    parser.add_argument("strategy", nargs="?", default="random",
+                        help="AI strategy to play against (default: random)")
+    args = parser.parse_args()
+
+    # Listing every strategy scans installed packages, so only do it for an unknown name
+    try:
+        get_strategy(args.strategy)
+    except KeyError as error:
+        parser.error(error.args[0])
+
     print("Battleship Game")
 
     print("Play interactive game : ")
 
-    play_interactive_game("random")
\ No newline at end of file
+    play_interactive_game(args.strategy)
\ No newline at end of file